@@ -6,7 +6,10 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from src.main import main
-
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from src.cli import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+
+    from src.main import main
     main()
@@ -0,0 +1,52 @@
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class AnnotatedImage:
+    __slots__ = ("image_path", "analysis_data", "on_render", "_renderer", "_renders", "_lock")
+
+    def __init__(self, image_path: str, analysis_data: Dict, renderer: Callable,
+                 renders: Optional[Dict[Tuple[int, int], np.ndarray]] = None,
+                 on_render: Optional[Callable[[], None]] = None):
+        self.image_path = image_path
+        self.analysis_data = analysis_data
+        self.on_render = on_render
+        self._renderer = renderer
+        self._renders: Dict[Tuple[int, int], np.ndarray] = dict(renders or {})
+        self._lock = threading.Lock()
+
+    def render(self, max_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        key = (int(max_size[0]), int(max_size[1])) if max_size is not None else None
+
+        grew = False
+        with self._lock:
+            image = self._renders.get(key)
+            if image is None:
+                image = self._renderer(self.image_path, self.analysis_data, max_size=key)
+                if key is not None:
+                    self._renders[key] = image
+                    grew = True
+
+        if grew and self.on_render is not None:
+            self.on_render()
+
+        return image
+
+    @property
+    def renderer(self) -> Callable:
+        return self._renderer
+
+    @property
+    def renders(self) -> Dict[Tuple[int, int], np.ndarray]:
+        with self._lock:
+            return dict(self._renders)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(image.nbytes for image in self._renders.values())
+
+    def clear(self):
+        with self._lock:
+            self._renders.clear()
@@ -0,0 +1,281 @@
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import KEYPOINT_NAMES, CONFIDENCE_LEVELS, POSTURE_CLASSIFICATION_MAP
+
+_LEVEL_RANGES = sorted(CONFIDENCE_LEVELS.items())
+_LEVEL_MINS = np.array([low for (low, _), _ in _LEVEL_RANGES], dtype=np.float64)
+_LEVEL_MAXS = np.array([high for (_, high), _ in _LEVEL_RANGES], dtype=np.float64)
+_LEVEL_LABELS = np.array([label for _, label in _LEVEL_RANGES] + ["Unknown"], dtype=object)
+
+_NUM_KEYPOINTS = len(KEYPOINT_NAMES)
+_KEYPOINT_ORDER = [KEYPOINT_NAMES[idx] for idx in range(_NUM_KEYPOINTS)]
+_KEYPOINT_INDEX = {name: idx for idx, name in KEYPOINT_NAMES.items()}
+
+
+def confidence_levels(confidences: np.ndarray) -> np.ndarray:
+    conf = np.asarray(confidences, dtype=np.float64)
+
+    idx = np.searchsorted(_LEVEL_MINS, conf, side="right") - 1
+    safe_idx = np.clip(idx, 0, len(_LEVEL_MINS) - 1)
+    valid = (idx >= 0) & (conf < _LEVEL_MAXS[safe_idx])
+
+    return _LEVEL_LABELS[np.where(valid, safe_idx, len(_LEVEL_LABELS) - 1)]
+
+
+def confidence_level(confidence: float) -> str:
+    return confidence_levels(np.array([confidence]))[0]
+
+
+class Keypoints(Mapping):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Optional[np.ndarray] = None):
+        if data is None:
+            data = np.zeros((_NUM_KEYPOINTS, 3), dtype=np.float32)
+        else:
+            data = np.asarray(data, dtype=np.float32)[:_NUM_KEYPOINTS]
+        self._data = data
+
+    @classmethod
+    def from_dict(cls, keypoints: Mapping) -> "Keypoints":
+        data = np.zeros((_NUM_KEYPOINTS, 3), dtype=np.float32)
+
+        for name, kpt in keypoints.items():
+            idx = _KEYPOINT_INDEX.get(name)
+            if idx is not None:
+                x, y = kpt["position"]
+                data[idx] = (x, y, kpt.get("confidence", 0.0))
+
+        return cls(data)
+
+    @classmethod
+    def coerce(cls, keypoints) -> "Keypoints":
+        if isinstance(keypoints, Keypoints):
+            return keypoints
+        if isinstance(keypoints, np.ndarray):
+            return cls(keypoints)
+        return cls.from_dict(keypoints or {})
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._data
+
+    @property
+    def xy(self) -> np.ndarray:
+        return self._data[:, :2]
+
+    @property
+    def confidences(self) -> np.ndarray:
+        return self._data[:, 2]
+
+    @property
+    def present(self) -> np.ndarray:
+        return self._data[:, 2] > 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def position(self, name: str) -> Tuple[float, float]:
+        x, y = self._data[_KEYPOINT_INDEX[name], :2].tolist()
+        return (x, y)
+
+    def confidence(self, name: str) -> float:
+        return float(self._data[_KEYPOINT_INDEX[name], 2])
+
+    def to_dict(self) -> Dict:
+        return {name: self[name] for name in self}
+
+    def __getitem__(self, name: str) -> Dict:
+        idx = _KEYPOINT_INDEX.get(name)
+        if idx is None or not self._data[idx, 2] > 0.0:
+            raise KeyError(name)
+
+        x, y, conf = self._data[idx].tolist()
+        return {
+            "position": (x, y),
+            "confidence": conf,
+            "confidence_level": confidence_level(conf)
+        }
+
+    def __contains__(self, name) -> bool:
+        idx = _KEYPOINT_INDEX.get(name)
+        return idx is not None and bool(self._data[idx, 2] > 0.0)
+
+    def __iter__(self):
+        return (_KEYPOINT_ORDER[idx] for idx in np.flatnonzero(self.present).tolist())
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.present))
+
+    def __repr__(self) -> str:
+        return f"Keypoints({len(self)} present)"
+
+
+def _keypoint_accessor(idx: int):
+    return property(lambda self: self._data[idx])
+
+
+for _idx, _name in KEYPOINT_NAMES.items():
+    setattr(Keypoints, _name, _keypoint_accessor(_idx))
+
+
+class Detection(Mapping):
+    __slots__ = ("index", "class_name", "confidence", "confidence_level", "bbox", "keypoints")
+
+    _FIELDS = ("index", "class", "classification", "sub_category", "confidence",
+               "confidence_percent", "confidence_level", "bbox", "width", "height",
+               "center", "area", "keypoints")
+
+    def __init__(self, index: int, class_name: str, confidence: float, confidence_level: str,
+                 bbox: np.ndarray, keypoints):
+        self.index = index
+        self.class_name = class_name
+        self.confidence = confidence
+        self.confidence_level = confidence_level
+        self.bbox = bbox
+        self.keypoints = keypoints
+
+    @property
+    def classification(self) -> str:
+        return POSTURE_CLASSIFICATION_MAP.get(self.class_name, self.class_name)
+
+    def to_dict(self) -> Dict:
+        return {key: self[key] for key in self._FIELDS}
+
+    def __getitem__(self, key: str):
+        if key == "index":
+            return self.index
+        if key in ("class", "sub_category"):
+            return self.class_name
+        if key == "classification":
+            return self.classification
+        if key == "confidence":
+            return self.confidence
+        if key == "confidence_percent":
+            return round(self.confidence * 100, 1)
+        if key == "confidence_level":
+            return self.confidence_level
+        if key == "keypoints":
+            return self.keypoints
+
+        x1, y1, x2, y2 = self.bbox
+        if key == "bbox":
+            return [float(x1), float(y1), float(x2), float(y2)]
+        if key == "width":
+            return float(x2 - x1)
+        if key == "height":
+            return float(y2 - y1)
+        if key == "center":
+            return (float((x1 + x2) / 2), float((y1 + y2) / 2))
+        if key == "area":
+            return float((x2 - x1) * (y2 - y1))
+
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._FIELDS)
+
+    def __len__(self) -> int:
+        return len(self._FIELDS)
+
+    def __repr__(self) -> str:
+        return f"Detection({self.index}, {self.class_name!r}, {self.confidence:.2f})"
+
+
+class RawDetections:
+    __slots__ = ("boxes", "confidences", "class_ids", "keypoints", "names")
+
+    def __init__(self, boxes: np.ndarray, confidences: np.ndarray, class_ids: np.ndarray,
+                 keypoints: Optional[np.ndarray], names: Dict[int, str]):
+        self.boxes = boxes
+        self.confidences = confidences
+        self.class_ids = class_ids
+        self.keypoints = keypoints
+        self.names = names
+
+    @classmethod
+    def from_result(cls, result) -> "RawDetections":
+        names = dict(result.names)
+
+        if result.boxes is None or len(result.boxes) == 0:
+            return cls.empty(names)
+
+        data = result.boxes.data.cpu().numpy()
+        boxes = np.ascontiguousarray(data[:, :4], dtype=np.float32)
+        confidences = np.ascontiguousarray(data[:, -2], dtype=np.float32)
+        class_ids = data[:, -1].astype(np.int64)
+
+        keypoints = None
+        if getattr(result, "keypoints", None) is not None and result.keypoints.data is not None:
+            kpts = result.keypoints.data.cpu().numpy().astype(np.float32, copy=False)
+            if kpts.shape[-1] == 2:
+                kpts = np.concatenate([kpts, np.zeros(kpts.shape[:-1] + (1,), dtype=np.float32)], axis=-1)
+            keypoints = kpts
+
+        return cls(boxes, confidences, class_ids, keypoints, names)
+
+    @classmethod
+    def empty(cls, names: Dict[int, str]) -> "RawDetections":
+        return cls(np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.float32),
+                   np.zeros(0, dtype=np.int64), None, names)
+
+    def __len__(self) -> int:
+        return len(self.confidences)
+
+    def filter(self, confidence_threshold: float) -> "RawDetections":
+        keep = self.confidences > confidence_threshold
+        if keep.all():
+            return self
+
+        keypoints = self.keypoints[keep] if self.keypoints is not None else None
+        return RawDetections(self.boxes[keep], self.confidences[keep], self.class_ids[keep],
+                             keypoints, self.names)
+
+    def to_detections(self) -> List[Detection]:
+        if len(self) == 0:
+            return []
+
+        levels = confidence_levels(self.confidences).tolist()
+        confs = self.confidences.tolist()
+        has_keypoints = self.keypoints is not None
+
+        detections = []
+        for idx, cls in enumerate(self.class_ids.tolist()):
+            if has_keypoints and idx < len(self.keypoints):
+                keypoints = Keypoints(self.keypoints[idx])
+            else:
+                keypoints = Keypoints()
+
+            detections.append(Detection(idx + 1, self.names[cls], confs[idx], levels[idx],
+                                        self.boxes[idx], keypoints))
+
+        return detections
+
+
+def build_analysis_data(image_path: str, raw_detections: List[RawDetections], processing_time: float) -> Dict:
+    analysis_data = {
+        "image_path": image_path,
+        "detections": [],
+        "total_detections": 0,
+        "classifications": {},
+        "processing_time": 0
+    }
+
+    for raw in raw_detections:
+        detections = raw.to_detections()
+        analysis_data["detections"].extend(detections)
+
+        for detection in detections:
+            classification = detection["classification"]
+            if classification not in analysis_data["classifications"]:
+                analysis_data["classifications"][classification] = 0
+            analysis_data["classifications"][classification] += 1
+
+    analysis_data["total_detections"] = len(analysis_data["detections"])
+    analysis_data["processing_time"] = round(processing_time, 2)
+
+    return analysis_data
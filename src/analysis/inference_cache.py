@@ -0,0 +1,146 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.analysis.detections import RawDetections
+from src.config import TEMP_DIR, INFERENCE_CACHE_MAX_BYTES
+
+INFERENCE_CACHE_DIR = TEMP_DIR / "inference_cache"
+CACHE_FORMAT_VERSION = 1
+
+
+class InferenceCache:
+    def __init__(self, cache_dir: Path = INFERENCE_CACHE_DIR, max_bytes: int = INFERENCE_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._image_digests: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def make_key(self, image_path: str, model_digest: str, params: Dict) -> str:
+        sha = hashlib.sha256()
+        sha.update(f"v{CACHE_FORMAT_VERSION}".encode())
+        sha.update(self.image_digest(image_path).encode())
+        sha.update(model_digest.encode())
+        sha.update(json.dumps(params, sort_keys=True).encode())
+        return sha.hexdigest()
+
+    def image_digest(self, image_path: str) -> str:
+        path = str(Path(image_path).resolve())
+        stat = os.stat(path)
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._image_digests.get(path)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            self._image_digests[path] = (fingerprint, digest)
+
+        return digest
+
+    def get(self, key: str) -> Optional[RawDetections]:
+        path = self._entry_path(key)
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                keypoints = data["keypoints"] if data["has_keypoints"] else None
+                names = json.loads(str(data["names"]))
+                raw = RawDetections(data["boxes"], data["confidences"], data["class_ids"],
+                                    keypoints, {int(k): v for k, v in names.items()})
+            os.utime(path)
+            return raw
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Inference cache: dropping unreadable entry {key[:12]}: {e}")
+            self._remove(path)
+            return None
+
+    def put(self, key: str, raw: RawDetections):
+        path = self._entry_path(key)
+        has_keypoints = raw.keypoints is not None
+
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            boxes=raw.boxes.astype(np.float32),
+            confidences=raw.confidences.astype(np.float32),
+            class_ids=raw.class_ids.astype(np.int16),
+            keypoints=raw.keypoints.astype(np.float32) if has_keypoints else np.zeros((0, 17, 3), np.float32),
+            has_keypoints=np.array(has_keypoints),
+            names=np.array(json.dumps({str(k): v for k, v in raw.names.items()}))
+        )
+
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(buffer.getvalue())
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += buffer.tell()
+        self._evict()
+
+    def clear(self):
+        for path in self.cache_dir.glob("*.npz"):
+            self._remove(path)
+        with self._lock:
+            self._total_bytes = 0
+
+    def _evict(self):
+        with self._lock:
+            if self._total_bytes is not None and self._total_bytes <= self.max_bytes:
+                return
+
+            entries = []
+            for path in self.cache_dir.glob("*.npz"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+            self._total_bytes = total
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+
+_inference_cache: Optional[InferenceCache] = None
+_inference_cache_lock = threading.Lock()
+
+
+def get_inference_cache() -> InferenceCache:
+    global _inference_cache
+
+    with _inference_cache_lock:
+        if _inference_cache is None:
+            _inference_cache = InferenceCache()
+        return _inference_cache
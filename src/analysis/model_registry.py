@@ -0,0 +1,155 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from ultralytics import YOLO
+
+from src.config import MODEL_REGISTRY_MAX_BYTES, MODEL_WARMUP_SIZE
+
+
+class ModelLoadCancelled(Exception):
+    pass
+
+
+class ModelRegistry:
+    def __init__(self, max_bytes: int = MODEL_REGISTRY_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._models: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        self._digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._loading: Dict[Tuple[str, str], Dict] = {}
+        self._lock = threading.RLock()
+
+    def get(self, model_path: str, progress: Optional[Callable[[str], None]] = None,
+            cancel: Optional[threading.Event] = None) -> YOLO:
+        report = progress or (lambda stage: None)
+        path = str(Path(model_path).resolve())
+
+        report("hashing")
+        key = (path, self.file_digest(path))
+
+        while True:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    report("ready")
+                    return entry["model"]
+
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = {"done": threading.Event(), "model": None}
+                    self._loading[key] = loading
+                    break
+
+            report("loading")
+            while not loading["done"].wait(0.1):
+                self._check_cancelled(cancel)
+            if loading["model"] is not None:
+                report("ready")
+                return loading["model"]
+
+        try:
+            self._check_cancelled(cancel)
+
+            report("loading")
+            model = YOLO(path)
+
+            report("warming up")
+            self._warm_up(model)
+
+            with self._lock:
+                self._invalidate_stale(path, key)
+                self._models[key] = {"model": model, "bytes": self._estimate_model_bytes(model)}
+                self._evict()
+            loading["model"] = model
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            loading["done"].set()
+
+        self._check_cancelled(cancel)
+        report("ready")
+        return model
+
+    def file_digest(self, model_path: str) -> str:
+        path = str(Path(model_path).resolve())
+        stat = os.stat(path)
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._digests.get(path)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            self._digests[path] = (fingerprint, digest)
+
+        return digest
+
+    def is_loaded(self, model_path: str) -> bool:
+        path = str(Path(model_path).resolve())
+        try:
+            key = (path, self.file_digest(path))
+        except OSError:
+            return False
+
+        with self._lock:
+            return key in self._models
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._digests.clear()
+
+    def _check_cancelled(self, cancel: Optional[threading.Event]):
+        if cancel is not None and cancel.is_set():
+            raise ModelLoadCancelled()
+
+    def _invalidate_stale(self, path: str, current_key: Tuple[str, str]):
+        for key in [k for k in self._models if k[0] == path and k != current_key]:
+            del self._models[key]
+            print(f"Model registry: {Path(path).name} changed on disk, reloading")
+
+    def _evict(self):
+        total = sum(entry["bytes"] for entry in self._models.values())
+
+        while total > self.max_bytes and len(self._models) > 1:
+            key, entry = self._models.popitem(last=False)
+            total -= entry["bytes"]
+            print(f"Model registry: evicted {Path(key[0]).name}")
+
+    def _warm_up(self, model: YOLO):
+        dummy = np.zeros((MODEL_WARMUP_SIZE, MODEL_WARMUP_SIZE, 3), dtype=np.uint8)
+        try:
+            model(dummy, verbose=False)
+        except Exception as e:
+            print(f"Model warm-up failed: {e}")
+
+    def _estimate_model_bytes(self, model: YOLO) -> int:
+        try:
+            return sum(p.numel() * p.element_size() for p in model.model.parameters())
+        except Exception:
+            return os.path.getsize(model.ckpt_path) if getattr(model, "ckpt_path", None) else 0
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    global _registry
+
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -0,0 +1,181 @@
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.analysis.detections import RawDetections
+from src.analysis.inference_cache import InferenceCache, get_inference_cache
+from src.analysis.model_registry import get_model_registry
+from src.analysis.yolo_analyzer import YOLOPostureAnalyzer
+from src.config import ANALYSIS_WORKERS, TORCH_THREADS_PER_WORKER, INFERENCE_CACHE_ENABLED
+from src.utils.frame import Frame
+
+_worker_model = None
+_worker_error: Optional[str] = None
+
+Layout = List[Tuple[str, str, Tuple[int, ...], int]]
+
+
+def _pack_arrays(arrays: Dict[str, np.ndarray]) -> Tuple[Optional[str], Layout]:
+    layout = []
+    offset = 0
+    for name, array in arrays.items():
+        layout.append((name, array.dtype.str, array.shape, offset))
+        offset += array.nbytes
+
+    if offset == 0:
+        return None, layout
+
+    shm = shared_memory.SharedMemory(create=True, size=offset)
+    for (name, _, _, start), array in zip(layout, arrays.values()):
+        shm.buf[start:start + array.nbytes] = np.ascontiguousarray(array).view(np.uint8).reshape(-1)
+
+    shm_name = shm.name
+    _forget(shm)
+    shm.close()
+
+    return shm_name, layout
+
+
+def _unpack_arrays(shm_name: Optional[str], layout: Layout, unlink: bool) -> Dict[str, np.ndarray]:
+    if shm_name is None:
+        return {name: np.zeros(shape, dtype=np.dtype(dtype)) for name, dtype, shape, _ in layout}
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    if not unlink:
+        _forget(shm)
+    try:
+        arrays = {}
+        for name, dtype, shape, start in layout:
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            arrays[name] = np.frombuffer(shm.buf, dtype=dtype, count=count, offset=start).reshape(shape).copy()
+        return arrays
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+
+
+def _forget(shm: shared_memory.SharedMemory):
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+def _unlink(shm_name: Optional[str]):
+    if shm_name is None:
+        return
+    try:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        shm.close()
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _init_worker(model_path: str, threads: int):
+    global _worker_model, _worker_error
+
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+
+    import cv2
+    import torch
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+    cv2.setNumThreads(1)
+
+    try:
+        _worker_model = get_model_registry().get(model_path)
+    except Exception as e:
+        _worker_error = f"{type(e).__name__}: {e}"
+
+
+def _require_model():
+    if _worker_model is None:
+        raise RuntimeError(f"Worker failed to load model: {_worker_error}")
+    return _worker_model
+
+
+def _worker_names() -> Dict[int, str]:
+    return dict(_require_model().names)
+
+
+def _infer_task(task: Tuple[str, Optional[str], Layout, float]):
+    image_path, frame_shm, frame_layout, confidence_threshold = task
+
+    if frame_shm is not None:
+        image = _unpack_arrays(frame_shm, frame_layout, unlink=False)["frame"]
+    else:
+        image = Frame(image_path).bgr
+
+    start_time = time.time()
+    results = _require_model()(image, conf=confidence_threshold, verbose=False)
+    elapsed = time.time() - start_time
+
+    raw = RawDetections.from_result(results[0])
+    arrays = {"boxes": raw.boxes, "confidences": raw.confidences, "class_ids": raw.class_ids}
+    if raw.keypoints is not None:
+        arrays["keypoints"] = raw.keypoints
+
+    shm_name, layout = _pack_arrays(arrays)
+    return shm_name, layout, elapsed
+
+
+class ProcessPoolAnalyzer(YOLOPostureAnalyzer):
+    def __init__(self, model_path: str, workers: int = ANALYSIS_WORKERS,
+                 threads_per_worker: int = TORCH_THREADS_PER_WORKER, cache: Optional[InferenceCache] = None):
+        self.model = None
+        self.model_path = model_path
+        self.model_digest = get_model_registry().file_digest(model_path)
+        self.cache = cache if cache is not None else (get_inference_cache() if INFERENCE_CACHE_ENABLED else None)
+        self.workers = max(1, int(workers))
+        self.threads_per_worker = max(1, int(threads_per_worker or (os.cpu_count() or 1) // self.workers))
+
+        context = mp.get_context("spawn")
+        self._pool = context.Pool(processes=self.workers, initializer=_init_worker,
+                                  initargs=(model_path, self.threads_per_worker))
+        try:
+            self.names = self._pool.apply(_worker_names)
+        except Exception:
+            self._pool.terminate()
+            self._pool.join()
+            raise
+
+        print(f"Process pool ready: {self.workers} workers x {self.threads_per_worker} threads")
+
+    def _infer_frames(self, frames: List[Frame], confidence_threshold: float, batch_size: int):
+        tasks = [self._make_task(frame, confidence_threshold) for frame in frames]
+
+        completed = 0
+        try:
+            for task, (shm_name, layout, elapsed) in zip(tasks, self._pool.imap(_infer_task, tasks, chunksize=1)):
+                _unlink(task[1])
+                completed += 1
+
+                arrays = _unpack_arrays(shm_name, layout, unlink=True)
+                yield RawDetections(arrays["boxes"], arrays["confidences"], arrays["class_ids"],
+                                    arrays.get("keypoints"), self.names), elapsed
+        finally:
+            for task in tasks[completed:]:
+                _unlink(task[1])
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def _make_task(self, frame: Frame, confidence_threshold: float):
+        if frame.is_decoded:
+            shm_name, layout = _pack_arrays({"frame": frame.bgr})
+            return (frame.image_path, shm_name, layout, confidence_threshold)
+
+        return (frame.image_path, None, [], confidence_threshold)
@@ -0,0 +1,178 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.config import PIPELINE_QUEUE_SIZE
+
+_DONE = object()
+
+
+class Stage:
+    def __init__(self, name: str, func: Callable, workers: int = 1, batch_size: int = 1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+
+        self.items = 0
+        self.busy_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, items: int, busy_time: float):
+        with self._lock:
+            self.items += items
+            self.busy_time += busy_time
+
+
+class AnalysisPipeline:
+    def __init__(self, stages: List[Stage], queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.stages = stages
+        self.queue_size = max(1, int(queue_size))
+        self.wall_time = 0.0
+
+        self._error: Optional[BaseException] = None
+        self._stop = threading.Event()
+
+    def run(self, items: Iterable) -> List:
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        outputs: Dict[int, object] = {}
+
+        threads = []
+        for stage_idx, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for worker_idx in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(stage, queues[stage_idx], queues[stage_idx + 1], remaining, lock),
+                    name=f"pipeline-{stage.name}-{worker_idx}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        collector = threading.Thread(target=self._collect, args=(queues[-1], outputs), daemon=True)
+        collector.start()
+
+        start_time = time.time()
+        try:
+            for index, item in enumerate(items):
+                if not self._put(queues[0], (index, item)):
+                    break
+        finally:
+            self._put(queues[0], _DONE, force=True)
+
+        for thread in threads:
+            thread.join()
+        collector.join()
+        self.wall_time = time.time() - start_time
+
+        if self._error is not None:
+            raise self._error
+
+        return [outputs[index] for index in sorted(outputs)]
+
+    def stats(self) -> List[Dict]:
+        stats = []
+        for stage in self.stages:
+            capacity = self.wall_time * stage.workers
+            stats.append({
+                "stage": stage.name,
+                "workers": stage.workers,
+                "items": stage.items,
+                "busy_time": round(stage.busy_time, 3),
+                "utilization": round(stage.busy_time / capacity, 3) if capacity > 0 else 0.0
+            })
+        return stats
+
+    def report(self):
+        print(f"Pipeline finished in {self.wall_time:.2f}s")
+        for stat in self.stats():
+            print(f"  {stat['stage']:<10} workers={stat['workers']} items={stat['items']} "
+                  f"busy={stat['busy_time']:.2f}s utilization={stat['utilization']:.0%}")
+
+    def _worker(self, stage: Stage, in_queue: queue.Queue, out_queue: queue.Queue,
+                remaining: List[int], lock: threading.Lock):
+        try:
+            while True:
+                batch = self._take(in_queue, stage.batch_size)
+                if batch is None:
+                    return
+                if self._stop.is_set():
+                    continue
+
+                start_time = time.time()
+                try:
+                    if stage.batch_size > 1:
+                        outputs = stage.func([item for _, item in batch])
+                    else:
+                        outputs = [stage.func(batch[0][1])]
+                except BaseException as e:
+                    self._fail(e)
+                    continue
+                stage.record(len(batch), time.time() - start_time)
+
+                for (index, _), output in zip(batch, outputs):
+                    if output is not None:
+                        self._put(out_queue, (index, output))
+        finally:
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                self._put(out_queue, _DONE, force=True)
+            else:
+                in_queue.put(_DONE)
+
+    def _take(self, in_queue: queue.Queue, batch_size: int):
+        first = in_queue.get()
+        if first is _DONE:
+            return None
+
+        batch = [first]
+        while len(batch) < batch_size:
+            try:
+                item = in_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                in_queue.put(_DONE)
+                break
+            batch.append(item)
+
+        return batch
+
+    def _collect(self, out_queue: queue.Queue, outputs: Dict[int, object]):
+        while True:
+            item = out_queue.get()
+            if item is _DONE:
+                return
+            index, output = item
+            outputs[index] = output
+
+    def _put(self, target: queue.Queue, item, force: bool = False) -> bool:
+        while True:
+            if self._stop.is_set() and not force:
+                return False
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if self._stop.is_set():
+                    self._drain(target)
+
+    def _drain(self, target: queue.Queue):
+        try:
+            while True:
+                item = target.get_nowait()
+                if item is _DONE:
+                    target.put_nowait(_DONE)
+                    return
+        except queue.Empty:
+            pass
+
+    def _fail(self, error: BaseException):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
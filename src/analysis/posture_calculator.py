@@ -1,13 +1,28 @@
 import numpy as np
 import math
 from typing import Dict, Tuple, Optional
+from src.analysis.detections import Keypoints
+
+HEAD_KEYPOINTS = [0, 1, 2, 3, 4]
+FEET_KEYPOINTS = [15, 16]
+NOSE, LEFT_EAR, RIGHT_EAR = 0, 3, 4
+LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP = 5, 6, 11, 12
+DEFAULT_HEIGHT_PIXELS = 5712
+
+ANALYSIS_EMPTY, ANALYSIS_BACK_FRONT, ANALYSIS_SIDE = 0, 1, 2
+ANALYSIS_KINDS = {"back_front_analysis": ANALYSIS_BACK_FRONT, "side_analysis": ANALYSIS_SIDE}
+
+BATCH_METRIC_KEYS = ("ratio", "shoulder_imbalance", "hip_imbalance", "spine_deviation",
+                     "shoulder_angle", "hip_angle", "head_shift", "head_tilt", "score")
 
 class PostureCalculator:
     def __init__(self, actual_height_mm: float):
         self.actual_height_mm = actual_height_mm
         self.ratio_mm_per_pixel = None
 
-    def calculate_posture_metrics(self, keypoints: Dict, analysis_type: str) -> Dict:
+    def calculate_posture_metrics(self, keypoints, analysis_type: str) -> Dict:
+        keypoints = Keypoints.coerce(keypoints)
+
         if not keypoints:
             return self._empty_metrics()
 
@@ -20,39 +35,131 @@ class PostureCalculator:
         else:
             return self._empty_metrics()
 
-    def _estimate_ratio(self, keypoints: Dict):
+    def calculate_batch_metrics(self, keypoints: np.ndarray, analysis_types,
+                                heights_mm=None) -> Dict[str, np.ndarray]:
+        data = np.asarray(keypoints, dtype=np.float64).reshape(-1, 17, 3)
+        count = len(data)
+
+        if isinstance(analysis_types, str):
+            analysis_types = [analysis_types] * count
+        kinds = np.array([ANALYSIS_KINDS.get(t, ANALYSIS_EMPTY) for t in analysis_types], dtype=np.int8)
+
+        if heights_mm is None:
+            heights_mm = self.actual_height_mm
+        heights = np.broadcast_to(np.asarray(heights_mm, dtype=np.float64), (count,))
+
+        x, y = data[:, :, 0], data[:, :, 1]
+        present = data[:, :, 2] > 0.0
+
+        kinds[~present.any(axis=1)] = ANALYSIS_EMPTY
+        back_front = kinds == ANALYSIS_BACK_FRONT
+        side = kinds == ANALYSIS_SIDE
+
+        head_y = np.where(present[:, HEAD_KEYPOINTS], y[:, HEAD_KEYPOINTS], np.inf).min(axis=1)
+        feet_y = np.where(present[:, FEET_KEYPOINTS], y[:, FEET_KEYPOINTS], -np.inf).max(axis=1)
+        with np.errstate(invalid="ignore"):
+            height_pixels = np.abs(feet_y - head_y)
+        has_height = np.isfinite(head_y) & np.isfinite(feet_y) & (height_pixels > 0)
+        ratio = heights / np.where(has_height, height_pixels, DEFAULT_HEIGHT_PIXELS)
+
+        metrics = {key: np.zeros(count, dtype=np.float64) for key in BATCH_METRIC_KEYS}
+        metrics["ratio"] = np.where(kinds != ANALYSIS_EMPTY, ratio, 0.0)
+
+        shoulders = back_front & present[:, LEFT_SHOULDER] & present[:, RIGHT_SHOULDER]
+        shoulder_dy = y[:, RIGHT_SHOULDER] - y[:, LEFT_SHOULDER]
+        shoulder_dx = x[:, RIGHT_SHOULDER] - x[:, LEFT_SHOULDER]
+        shoulder_diff_pixels = np.abs(shoulder_dy)
+        shoulder_mm = np.abs(shoulder_diff_pixels * ratio)
+        shoulder_mm = np.where(shoulder_diff_pixels > 50, np.minimum(shoulder_mm, 50.0), shoulder_mm)
+        metrics["shoulder_imbalance"] = np.where(shoulders, _round1(shoulder_mm), 0.0)
+        metrics["shoulder_angle"] = np.where(shoulders, _round1(np.degrees(np.arctan2(shoulder_dy, shoulder_dx))), 0.0)
+
+        hips = back_front & present[:, LEFT_HIP] & present[:, RIGHT_HIP]
+        hip_dy = y[:, RIGHT_HIP] - y[:, LEFT_HIP]
+        hip_dx = x[:, RIGHT_HIP] - x[:, LEFT_HIP]
+        metrics["hip_imbalance"] = np.where(hips, _round1(np.abs(np.abs(hip_dy) * ratio)), 0.0)
+        metrics["hip_angle"] = np.where(hips, _round1(np.degrees(np.arctan2(hip_dy, hip_dx))), 0.0)
+
+        spine = shoulders & hips
+        shoulder_center_x = (x[:, LEFT_SHOULDER] + x[:, RIGHT_SHOULDER]) / 2
+        hip_center_x = (x[:, LEFT_HIP] + x[:, RIGHT_HIP]) / 2
+        spine_deviation = np.abs(np.abs(shoulder_center_x - hip_center_x) * ratio)
+        metrics["spine_deviation"] = np.where(spine, _round1(spine_deviation), 0.0)
+
+        head_shift = side & present[:, NOSE] & present[:, LEFT_SHOULDER]
+        head_shift_pixels = np.abs(x[:, NOSE] - x[:, LEFT_SHOULDER])
+        metrics["head_shift"] = np.where(head_shift, _round1(head_shift_pixels * ratio), 0.0)
+
+        left_tilt = side & present[:, NOSE] & present[:, LEFT_EAR]
+        right_tilt = side & present[:, NOSE] & present[:, RIGHT_EAR] & ~left_tilt
+        ear = np.where(left_tilt, LEFT_EAR, RIGHT_EAR)
+        rows = np.arange(count)
+        tilt = np.abs(np.degrees(np.arctan2(y[rows, ear] - y[:, NOSE], x[rows, ear] - x[:, NOSE])))
+        metrics["head_tilt"] = np.where(left_tilt | right_tilt, _round1(tilt), 0.0)
+
+        metrics["score"] = self._calculate_batch_scores(metrics, kinds)
+        metrics["analysis_kind"] = kinds
+
+        return metrics
+
+    def batch_metrics_row(self, batch_metrics: Dict[str, np.ndarray], idx: int) -> Dict:
+        kind = int(batch_metrics["analysis_kind"][idx])
+
+        if kind == ANALYSIS_BACK_FRONT:
+            keys = ("ratio", "shoulder_imbalance", "hip_imbalance", "spine_deviation",
+                    "shoulder_angle", "hip_angle", "score")
+        elif kind == ANALYSIS_SIDE:
+            keys = ("ratio", "head_shift", "head_tilt", "score")
+        else:
+            return self._empty_metrics()
+
+        return {key: float(batch_metrics[key][idx]) for key in keys}
+
+    def _calculate_batch_scores(self, metrics: Dict[str, np.ndarray], kinds: np.ndarray) -> np.ndarray:
+        back_front = kinds == ANALYSIS_BACK_FRONT
+        side = kinds == ANALYSIS_SIDE
+
+        penalties = [
+            (back_front, "shoulder_imbalance", 5, 2, 40),
+            (back_front, "hip_imbalance", 5, 2, 30),
+            (back_front, "spine_deviation", 10, 1.5, 30),
+            (side, "head_shift", 20, 1.5, 50),
+            (side, "head_tilt", 10, 2, 50),
+        ]
+
+        score = np.full(len(kinds), 100.0)
+        for mask, key, threshold, weight, cap in penalties:
+            values = metrics[key]
+            score = np.where(mask & (values > threshold), score - np.minimum(values * weight, cap), score)
+
+        score = np.where(back_front | side, np.maximum(0.0, score), 0.0)
+
+        return _round1(score)
+
+    def _estimate_ratio(self, keypoints: Keypoints):
         estimated_height_pixels = self._estimate_person_height(keypoints)
 
         if estimated_height_pixels > 0:
             self.ratio_mm_per_pixel = self.actual_height_mm / estimated_height_pixels
         else:
-            default_height_pixels = 5712
-            self.ratio_mm_per_pixel = self.actual_height_mm / default_height_pixels
-
-    def _estimate_person_height(self, keypoints: Dict) -> float:
-        head_parts = ["nose", "left_eye", "right_eye", "left_ear", "right_ear"]
-        feet_parts = ["left_ankle", "right_ankle"]
-
-        head_points = []
-        for part in head_parts:
-            if part in keypoints:
-                x, y = keypoints[part]["position"]
-                head_points.append(y)
-
-        feet_points = []
-        for part in feet_parts:
-            if part in keypoints:
-                x, y = keypoints[part]["position"]
-                feet_points.append(y)
-
-        if head_points and feet_points:
-            top_y = min(head_points)
-            bottom_y = max(feet_points)
+            self.ratio_mm_per_pixel = self.actual_height_mm / DEFAULT_HEIGHT_PIXELS
+
+    def _estimate_person_height(self, keypoints: Keypoints) -> float:
+        data = keypoints.array
+
+        head = data[HEAD_KEYPOINTS]
+        feet = data[FEET_KEYPOINTS]
+        head_y = head[head[:, 2] > 0.0, 1]
+        feet_y = feet[feet[:, 2] > 0.0, 1]
+
+        if len(head_y) and len(feet_y):
+            top_y = float(head_y.min())
+            bottom_y = float(feet_y.max())
             return abs(bottom_y - top_y)
 
         return 0
 
-    def _calculate_back_front_metrics(self, keypoints: Dict) -> Dict:
+    def _calculate_back_front_metrics(self, keypoints: Keypoints) -> Dict:
         metrics = {
             "ratio": self.ratio_mm_per_pixel,
             "shoulder_imbalance": 0.0,
@@ -98,7 +205,7 @@ class PostureCalculator:
         metrics["score"] = self._calculate_posture_score(metrics, "back_front")
         return metrics
 
-    def _calculate_side_metrics(self, keypoints: Dict) -> Dict:
+    def _calculate_side_metrics(self, keypoints: Keypoints) -> Dict:
         metrics = {
             "ratio": self.ratio_mm_per_pixel,
             "head_shift": 0.0,
@@ -214,3 +321,15 @@ class PostureCalculator:
                 return "side_analysis"
 
         return "back_front_analysis"
+
+
+def _round1(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, 1)
+
+    scaled = values * 10
+    near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    for idx in np.flatnonzero(near_tie & np.isfinite(values)):
+        rounded.flat[idx] = round(float(values.flat[idx]), 1)
+
+    return rounded
@@ -0,0 +1,125 @@
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from src.analysis.posture_calculator import PostureCalculator
+from src.config import RESCORE_PAGE_SIZE, RESCORE_WRITE_BATCH_SIZE
+from src.utils.database import DatabaseManager
+
+RESCORE_COLUMNS = ("id, created_at, analysis_type, classification, score, measurements_packed, keypoints_packed, "
+                   "measurements, keypoints, user_sessions(height)")
+
+
+class RescoreJob:
+    def __init__(self, db_manager: DatabaseManager, page_size: int = RESCORE_PAGE_SIZE,
+                 write_batch_size: int = RESCORE_WRITE_BATCH_SIZE, dry_run: bool = False):
+        self.db_manager = db_manager
+        self.page_size = page_size
+        self.write_batch_size = write_batch_size
+        self.dry_run = dry_run
+        self.calculator = PostureCalculator(0.0)
+
+    def run(self) -> List[Dict]:
+        if not self.db_manager.connected:
+            raise RuntimeError("Database is not connected")
+
+        start_time = time.time()
+        scanned = 0
+        skipped = 0
+        changes = []
+        pending = []
+
+        for rows in self.db_manager.iter_analysis_pages(RESCORE_COLUMNS, self.page_size):
+            scanned += len(rows)
+
+            usable = [row for row in rows if self.has_keypoints(row)]
+            skipped += len(rows) - len(usable)
+            if not usable:
+                continue
+
+            for update, change in self.rescore_page(usable):
+                changes.append(change)
+                pending.append(update)
+                print(f"{change['id']}: score {change['old_score']} -> {change['new_score']}")
+
+            while len(pending) >= self.write_batch_size:
+                self._write(pending[:self.write_batch_size])
+                pending = pending[self.write_batch_size:]
+
+        if pending:
+            self._write(pending)
+
+        elapsed = time.time() - start_time
+        print(f"Rescored {scanned} rows in {elapsed:.1f}s, {len(changes)} changed, {skipped} skipped without keypoints"
+              + (" (dry run, nothing written)" if self.dry_run else ""))
+
+        return changes
+
+    def has_keypoints(self, row: Dict) -> bool:
+        if row.get("keypoints_packed") is not None:
+            return True
+        return bool(self.db_manager.decode_json_column(row.get("keypoints"), {}))
+
+    def rescore_page(self, rows: List[Dict]):
+        keypoints = np.zeros((len(rows), 17, 3), dtype=np.float32)
+        heights = np.zeros(len(rows), dtype=np.float64)
+        analysis_types = []
+
+        for idx, row in enumerate(rows):
+            keypoints[idx] = self.db_manager.decode_keypoints(row).array
+
+            session = row.get("user_sessions") or {}
+            heights[idx] = float(session.get("height") or 0.0)
+            analysis_types.append(row.get("analysis_type"))
+
+        batch = self.calculator.calculate_batch_metrics(keypoints, analysis_types, heights)
+
+        for idx, row in enumerate(rows):
+            metrics = self.calculator.batch_metrics_row(batch, idx)
+            old_metrics = self.db_manager.decode_measurements(row)
+            old_score = float(row["score"]) if row.get("score") is not None else None
+
+            if old_score == metrics["score"] and old_metrics == metrics:
+                continue
+
+            update = {
+                "id": row["id"],
+                "analysis_type": row["analysis_type"],
+                "classification": row["classification"],
+                "score": metrics["score"],
+                "measurements_packed": self.db_manager.encode_measurements(metrics)
+            }
+            change = {
+                "id": row["id"],
+                "old_score": old_score,
+                "new_score": metrics["score"],
+                "old_measurements": old_metrics,
+                "new_measurements": metrics
+            }
+            yield update, change
+
+    def _write(self, rows: List[Dict]):
+        if self.dry_run:
+            return
+
+        written = self.db_manager.update_analysis_results(rows)
+        if written != len(rows):
+            print(f"Warning: only {written} of {len(rows)} rescored rows were written")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute posture metrics and scores from stored keypoints")
+    parser.add_argument("--page-size", type=int, default=RESCORE_PAGE_SIZE)
+    parser.add_argument("--write-batch-size", type=int, default=RESCORE_WRITE_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Report changed rows without writing them")
+    args = parser.parse_args(argv)
+
+    job = RescoreJob(DatabaseManager(), page_size=args.page_size,
+                     write_batch_size=args.write_batch_size, dry_run=args.dry_run)
+    job.run()
+
+
+if __name__ == "__main__":
+    main()
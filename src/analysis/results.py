@@ -0,0 +1,55 @@
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.analysis.detections import RawDetections, build_analysis_data
+from src.analysis.posture_calculator import PostureCalculator
+
+RawAnalysis = Tuple[str, RawDetections, float]
+
+
+def build_results(raw_analyses: List[RawAnalysis], confidence_threshold: float,
+                  height_mm: Union[float, Sequence[float]]) -> List[Dict]:
+    if isinstance(height_mm, (int, float)):
+        heights = [float(height_mm)] * len(raw_analyses)
+    else:
+        heights = [float(height) for height in height_mm]
+
+    calculator = PostureCalculator(heights[0] if heights else 0.0)
+    results = []
+    result_heights = []
+
+    for (image_path, raw, processing_time), height in zip(raw_analyses, heights):
+        filtered = raw.filter(confidence_threshold)
+        analysis_data = build_analysis_data(image_path, [filtered], processing_time)
+
+        if not analysis_data["detections"]:
+            continue
+
+        detection = analysis_data["detections"][0]
+        classification = detection["classification"]
+
+        results.append({
+            "image_path": image_path,
+            "classification": classification,
+            "confidence": detection["confidence"],
+            "analysis_type": calculator.determine_analysis_type(classification),
+            "keypoints": detection["keypoints"],
+            "analysis_data": analysis_data,
+            "raw_detections": raw,
+            "processing_time": processing_time,
+            "detection_count": len(filtered)
+        })
+        result_heights.append(height)
+
+    if results:
+        keypoints = np.stack([result["keypoints"].array for result in results])
+        batch = calculator.calculate_batch_metrics(keypoints, [result["analysis_type"] for result in results],
+                                                   result_heights)
+
+        for idx, result in enumerate(results):
+            metrics = calculator.batch_metrics_row(batch, idx)
+            result["metrics"] = metrics
+            result["score"] = metrics.get("score", 0.0)
+
+    return results
@@ -0,0 +1,86 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.analysis.detections import RawDetections
+from src.config import INFERENCE_BATCH_SIZE
+
+
+class SpeculativeAnalysis:
+    def __init__(self, images: List[str], model_path: str, confidence_floor: float,
+                 analyzer_factory: Callable, batch_size: int = INFERENCE_BATCH_SIZE,
+                 previous: Optional["SpeculativeAnalysis"] = None):
+        self.images = list(images)
+        self.model_path = model_path
+        self.confidence_floor = confidence_floor
+        self.batch_size = max(1, int(batch_size))
+
+        self._analyzer_factory = analyzer_factory
+        self._previous = previous
+        self._results: Dict[str, Tuple[RawDetections, float]] = {}
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="speculative-analysis", daemon=True)
+        self._thread.start()
+
+    def matches(self, model_path: str, confidence_floor: float) -> bool:
+        return self.model_path == model_path and abs(self.confidence_floor - confidence_floor) < 1e-9
+
+    def cancel(self, wait: bool = False):
+        self._cancel.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def results(self) -> Dict[str, Tuple[RawDetections, float]]:
+        with self._lock:
+            return dict(self._results)
+
+    @property
+    def done(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+    def _run(self):
+        if self._previous is not None:
+            self._inherit(self._previous)
+            self._previous = None
+
+        pending = [image for image in self.images if image not in self._results]
+        if not pending or self._cancel.is_set():
+            return
+
+        start_time = time.time()
+        try:
+            analyzer = self._analyzer_factory(self.model_path)
+
+            for offset in range(0, len(pending), self.batch_size):
+                if self._cancel.is_set():
+                    break
+
+                chunk = pending[offset:offset + self.batch_size]
+                inferred = analyzer.infer_batch(chunk, self.confidence_floor, batch_size=self.batch_size)
+
+                with self._lock:
+                    for image_path, raw, elapsed in inferred:
+                        self._results[image_path] = (raw, elapsed)
+        except Exception as e:
+            print(f"Speculative analysis stopped: {e}")
+            return
+
+        state = "cancelled" if self._cancel.is_set() else "finished"
+        print(f"Speculative analysis {state}: {self.done}/{len(self.images)} images "
+              f"in {time.time() - start_time:.2f}s")
+
+    def _inherit(self, previous: "SpeculativeAnalysis"):
+        previous.cancel(wait=True)
+        if not previous.matches(self.model_path, self.confidence_floor):
+            return
+
+        wanted = set(self.images)
+        with self._lock:
+            for image_path, result in previous.results().items():
+                if image_path in wanted:
+                    self._results[image_path] = result
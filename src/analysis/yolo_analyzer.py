@@ -1,115 +1,89 @@
 import cv2
 import numpy as np
-from ultralytics import YOLO
 from typing import Dict, List, Tuple, Optional
 import time
-from src.config import KEYPOINT_NAMES, CONFIDENCE_LEVELS, POSTURE_CLASSIFICATION_MAP
+from src.config import INFERENCE_BATCH_SIZE, INFERENCE_CACHE_ENABLED
+from src.analysis.detections import RawDetections, build_analysis_data
+from src.analysis.inference_cache import InferenceCache, get_inference_cache
+from src.analysis.model_registry import get_model_registry
+from src.utils.frame import Frame, get_frame
 
 class YOLOPostureAnalyzer:
-    def __init__(self, model_path: str):
-        self.model = YOLO(model_path)
+    def __init__(self, model_path: str, cache: Optional[InferenceCache] = None):
+        registry = get_model_registry()
+        self.model = registry.get(model_path)
         self.model_path = model_path
-
-    def analyze_image(self, image_path: str, confidence_threshold: float = 0.25) -> Dict:
-        start_time = time.time()
-
-        results = self.model(image_path, conf=confidence_threshold)
-
-        analysis_data = {
-            "image_path": image_path,
-            "detections": [],
-            "total_detections": 0,
-            "classifications": {},
-            "processing_time": 0
-        }
-
-        for result in results:
-            if result.boxes is not None:
-                for idx, box in enumerate(result.boxes):
-                    detection = self._process_detection(box, result, idx)
-                    analysis_data["detections"].append(detection)
-
-                    classification = detection["classification"]
-                    if classification not in analysis_data["classifications"]:
-                        analysis_data["classifications"][classification] = 0
-                    analysis_data["classifications"][classification] += 1
-
-        analysis_data["total_detections"] = len(analysis_data["detections"])
-        analysis_data["processing_time"] = round(time.time() - start_time, 2)
-
-        return analysis_data
-
-    def _process_detection(self, box, result, idx: int) -> Dict:
-        conf = float(box.conf[0])
-        cls = int(box.cls[0])
-        class_name = result.names[cls]
-
-        classification = POSTURE_CLASSIFICATION_MAP.get(class_name, class_name)
-
-        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-        width = x2 - x1
-        height = y2 - y1
-        center_x = (x1 + x2) / 2
-        center_y = (y1 + y2) / 2
-        area = width * height
-
-        conf_level = self._get_confidence_level(conf)
-
-        detection = {
-            "index": idx + 1,
-            "class": class_name,
-            "classification": classification,
-            "sub_category": class_name,
-            "confidence": conf,
-            "confidence_percent": round(conf * 100, 1),
-            "confidence_level": conf_level,
-            "bbox": [float(x1), float(y1), float(x2), float(y2)],
-            "width": float(width),
-            "height": float(height),
-            "center": (float(center_x), float(center_y)),
-            "area": float(area),
-            "keypoints": {}
-        }
-
-        if hasattr(result, 'keypoints') and result.keypoints is not None:
-            detection["keypoints"] = self._extract_keypoints(result.keypoints, idx)
-
-        return detection
-
-    def _extract_keypoints(self, keypoints_data, detection_idx: int) -> Dict:
-        keypoints = {}
-
-        if keypoints_data.xy is not None and len(keypoints_data.xy) > detection_idx:
-            kpts_xy = keypoints_data.xy[detection_idx].cpu().numpy()
-            kpts_conf = keypoints_data.conf[detection_idx].cpu().numpy() if keypoints_data.conf is not None else None
-
-            for kpt_idx, (x, y) in enumerate(kpts_xy):
-                if kpt_idx in KEYPOINT_NAMES:
-                    kpt_name = KEYPOINT_NAMES[kpt_idx]
-                    confidence = float(kpts_conf[kpt_idx]) if kpts_conf is not None else 0.0
-
-                    if confidence > 0.0:
-                        keypoints[kpt_name] = {
-                            "position": (float(x), float(y)),
-                            "confidence": confidence,
-                            "confidence_level": self._get_confidence_level(confidence)
-                        }
-
-        return keypoints
-
-    def _get_confidence_level(self, conf: float) -> str:
-        for (min_val, max_val), level in CONFIDENCE_LEVELS.items():
-            if min_val <= conf < max_val:
-                return level
-        return "Unknown"
-
-    def annotate_image(self, image_path: str, analysis_data: Dict) -> np.ndarray:
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError(f"Could not load image: {image_path}")
+        self.model_digest = registry.file_digest(model_path)
+        self.cache = cache if cache is not None else (get_inference_cache() if INFERENCE_CACHE_ENABLED else None)
+
+    def analyze_image(self, image, confidence_threshold: float = 0.25) -> Dict:
+        return self.analyze_batch([image], confidence_threshold, batch_size=1)[0]
+
+    def analyze_batch(self, images: List, confidence_threshold: float = 0.25,
+                      batch_size: int = INFERENCE_BATCH_SIZE) -> List[Dict]:
+        return [build_analysis_data(image_path, [raw], elapsed)
+                for image_path, raw, elapsed in self.infer_batch(images, confidence_threshold, batch_size)]
+
+    def infer_batch(self, images: List, confidence_threshold: float = 0.25,
+                    batch_size: int = INFERENCE_BATCH_SIZE) -> List[Tuple[str, RawDetections, float]]:
+        frames = [get_frame(image) for image in images]
+        inferred = [None] * len(frames)
+        keys = [self._cache_key(frame, confidence_threshold) for frame in frames]
+
+        misses = []
+        for idx, (frame, key) in enumerate(zip(frames, keys)):
+            start_time = time.time()
+            raw = self.cache.get(key) if key is not None else None
+
+            if raw is not None:
+                inferred[idx] = (frame.image_path, raw, time.time() - start_time)
+            else:
+                misses.append(idx)
+
+        results = self._infer_frames([frames[idx] for idx in misses], confidence_threshold, batch_size)
+        for idx, (raw, elapsed) in zip(misses, results):
+            if keys[idx] is not None:
+                self.cache.put(keys[idx], raw)
+            inferred[idx] = (frames[idx].image_path, raw, elapsed)
+
+        return inferred
+
+    def _infer_frames(self, frames: List[Frame], confidence_threshold: float, batch_size: int):
+        batch_size = max(1, int(batch_size or 1))
+
+        for offset in range(0, len(frames), batch_size):
+            chunk = frames[offset:offset + batch_size]
+            start_time = time.time()
+
+            results = self.model([frame.bgr for frame in chunk], conf=confidence_threshold)
+
+            per_image_time = (time.time() - start_time) / len(chunk)
+            for result in results:
+                yield RawDetections.from_result(result), per_image_time
+
+    def _cache_key(self, frame: Frame, confidence_threshold: float) -> Optional[str]:
+        if self.cache is None:
+            return None
+
+        try:
+            return self.cache.make_key(frame.image_path, self.model_digest,
+                                       {"conf": round(float(confidence_threshold), 4)})
+        except OSError:
+            return None
+
+    def annotate_image(self, image, analysis_data: Dict,
+                       max_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        frame = get_frame(image)
+
+        if max_size is None:
+            image = frame.copy_bgr()
+            scale = 1.0
+        else:
+            image = np.array(frame.resized_bgr(max_size))
+            scale = image.shape[1] / frame.size[0]
 
         for detection in analysis_data["detections"]:
-            x1, y1, x2, y2 = detection["bbox"]
+            x1, y1, x2, y2 = [value * scale for value in detection["bbox"]]
 
             color = self._get_classification_color(detection["classification"])
 
@@ -123,11 +97,11 @@ class YOLOPostureAnalyzer:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
 
             if detection["keypoints"]:
-                self._draw_keypoints(image, detection["keypoints"])
+                self._draw_keypoints(image, detection["keypoints"], scale)
 
         return image
 
-    def _draw_keypoints(self, image: np.ndarray, keypoints: Dict):
+    def _draw_keypoints(self, image: np.ndarray, keypoints: Dict, scale: float = 1.0):
         skeleton = [
             ("left_shoulder", "right_shoulder"),
             ("left_shoulder", "left_elbow"),
@@ -149,6 +123,7 @@ class YOLOPostureAnalyzer:
 
         for kpt_name, kpt_data in keypoints.items():
             x, y = kpt_data["position"]
+            x, y = x * scale, y * scale
             conf = kpt_data["confidence"]
 
             if conf > 0.3:
@@ -163,7 +138,8 @@ class YOLOPostureAnalyzer:
                 if conf1 > 0.3 and conf2 > 0.3:
                     x1, y1 = keypoints[kpt1_name]["position"]
                     x2, y2 = keypoints[kpt2_name]["position"]
-                    cv2.line(image, (int(x1), int(y1)), (int(x2), int(y2)), (0, 255, 255), 2)
+                    cv2.line(image, (int(x1 * scale), int(y1 * scale)), (int(x2 * scale), int(y2 * scale)),
+                             (0, 255, 255), 2)
 
     def _get_classification_color(self, classification: str) -> Tuple[int, int, int]:
         colors = {
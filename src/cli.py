@@ -0,0 +1,182 @@
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from src.analysis.results import build_results
+from src.config import INFERENCE_BATCH_SIZE, INFERENCE_CONFIDENCE_FLOOR
+from src.utils.batch_export import ColumnarWriter, RESULT_STRING_COLUMNS, result_columns
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def collect_images(inputs: List[str]) -> List[str]:
+    images = []
+
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates = sorted(p for p in path.rglob("*") if p.suffix.lower() in IMAGE_EXTENSIONS)
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = sorted(p for p in map(Path, glob.glob(item, recursive=True))
+                                if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+        images.extend(str(p) for p in candidates if p.is_file())
+
+    return list(dict.fromkeys(images))
+
+
+def load_height_manifest(manifest_path: str) -> Dict[str, float]:
+    heights = {}
+
+    with open(manifest_path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            image = (row.get("image") or row.get("image_path") or "").strip()
+            if image:
+                heights[image] = float(row["height"])
+
+    return heights
+
+
+def resolve_height(image_path: str, manifest: Dict[str, float], default: Optional[float]) -> float:
+    for key in (image_path, str(Path(image_path).resolve()), Path(image_path).name):
+        if key in manifest:
+            return manifest[key]
+
+    if default is None:
+        raise ValueError(f"No height for {image_path} in manifest and no --height given")
+
+    return default
+
+
+def chunked(items: List[str], size: int) -> Iterator[List[str]]:
+    for offset in range(0, len(items), size):
+        yield items[offset:offset + size]
+
+
+def infer_chunk(analyzer, chunk: List[str], floor: float, batch_size: int):
+    try:
+        return analyzer.infer_batch(chunk, floor, batch_size=batch_size), []
+    except Exception as e:
+        if len(chunk) == 1:
+            print(f"Skipping {chunk[0]}: {e}")
+            return [], chunk
+
+    inferred = []
+    skipped = []
+    for image in chunk:
+        items, failed = infer_chunk(analyzer, [image], floor, batch_size)
+        inferred.extend(items)
+        skipped.extend(failed)
+
+    return inferred, skipped
+
+
+def run_batch(args) -> int:
+    images = collect_images(args.inputs)
+    if not images:
+        print("No images found")
+        return 1
+
+    manifest = load_height_manifest(args.height_manifest) if args.height_manifest else {}
+    heights = {image: resolve_height(image, manifest, args.height) for image in images}
+
+    if args.workers > 1:
+        from src.analysis.parallel import ProcessPoolAnalyzer
+        analyzer = ProcessPoolAnalyzer(args.model, workers=args.workers)
+    else:
+        from src.analysis.yolo_analyzer import YOLOPostureAnalyzer
+        analyzer = YOLOPostureAnalyzer(args.model)
+
+    db_manager = None
+    result_writer = None
+    if args.db:
+        from src.utils.database import DatabaseManager
+        from src.utils.db_writer import BufferedResultWriter
+        db_manager = DatabaseManager()
+        result_writer = BufferedResultWriter(db_manager)
+
+    writer = ColumnarWriter(args.output, RESULT_STRING_COLUMNS)
+    floor = min(INFERENCE_CONFIDENCE_FLOOR, args.confidence)
+    chunk_size = max(1, args.batch_size) * max(1, args.workers) * 4
+
+    start_time = time.time()
+    processed = 0
+    written = 0
+    skipped = 0
+    sessions = {}
+
+    try:
+        for chunk in chunked(images, chunk_size):
+            raw_analyses, failed = infer_chunk(analyzer, chunk, floor, args.batch_size)
+            skipped += len(failed)
+            results = build_results(raw_analyses, args.confidence, [heights[path] for path, _, _ in raw_analyses])
+
+            writer.write(result_columns(results))
+
+            if db_manager is not None:
+                for result in results:
+                    height = heights[result["image_path"]]
+                    if height not in sessions:
+                        sessions[height] = db_manager.save_user_session(args.name, height)
+                    if sessions[height]:
+                        result_writer.submit(sessions[height], {
+                            "analysis_type": result["analysis_type"],
+                            "classification": result["classification"],
+                            "confidence": result["confidence"],
+                            "score": result["score"],
+                            "measurements": result["metrics"],
+                            "keypoints": result["keypoints"]
+                        })
+
+            processed += len(chunk)
+            written += len(results)
+            rate = processed / max(time.time() - start_time, 1e-9)
+            print(f"{processed}/{len(images)} images, {written} results, {skipped} skipped ({rate:.1f} img/s)")
+    finally:
+        writer.close()
+        if result_writer is not None:
+            result_writer.close()
+        if hasattr(analyzer, "close"):
+            analyzer.close()
+
+    print(f"Wrote {written} results to {args.output} in {time.time() - start_time:.1f}s"
+          + (f", skipped {skipped} unreadable images" if skipped else ""))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="run.py batch",
+                                     description="Headless batch posture analysis (no GUI)")
+    parser.add_argument("inputs", nargs="+", help="Image directories or glob patterns")
+    parser.add_argument("--model", required=True, help="YOLO model (.pt)")
+    parser.add_argument("--height", type=float, help="Height in mm used for every image")
+    parser.add_argument("--height-manifest", help="CSV with columns image,height (mm)")
+    parser.add_argument("--output", required=True, help="Output .csv, .parquet or .arrow file")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=INFERENCE_BATCH_SIZE)
+    parser.add_argument("--confidence", type=float, default=0.25)
+    parser.add_argument("--db", action="store_true", help="Also save results to the database")
+    parser.add_argument("--name", default="batch", help="Session name used with --db")
+    return parser
+
+
+def main(argv=None) -> int:
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    args = build_parser().parse_args(argv)
+
+    if args.height is None and not args.height_manifest:
+        print("Either --height or --height-manifest is required")
+        return 2
+
+    return run_batch(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
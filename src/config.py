@@ -18,6 +18,56 @@ ICON_PATH = ASSETS_DIR / "kuro_rebranding_icon_full_clr_online.png"
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 
+INFERENCE_BATCH_SIZE = int(os.getenv("INFERENCE_BATCH_SIZE", "8"))
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "1"))
+TORCH_THREADS_PER_WORKER = int(os.getenv("TORCH_THREADS_PER_WORKER", "0"))
+INFERENCE_CONFIDENCE_FLOOR = float(os.getenv("INFERENCE_CONFIDENCE_FLOOR", "0.05"))
+INFERENCE_CACHE_ENABLED = os.getenv("INFERENCE_CACHE_ENABLED", "1") == "1"
+INFERENCE_CACHE_MAX_BYTES = int(os.getenv("INFERENCE_CACHE_MAX_MB", "256")) * 1024 * 1024
+MODEL_REGISTRY_MAX_BYTES = int(os.getenv("MODEL_REGISTRY_MAX_MB", "512")) * 1024 * 1024
+MODEL_WARMUP_SIZE = 640
+
+FRAME_CACHE_MAX_BYTES = int(os.getenv("FRAME_CACHE_MAX_MB", "512")) * 1024 * 1024
+FRAME_CACHE_MAX_FRAMES = 1024
+
+CHART_CACHE_MAX_BYTES = int(os.getenv("CHART_CACHE_MAX_MB", "32")) * 1024 * 1024
+
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+PIPELINE_STAGE_WORKERS = {
+    "decode": int(os.getenv("PIPELINE_DECODE_WORKERS", "2")),
+    "infer": int(os.getenv("PIPELINE_INFER_WORKERS", "1")),
+    "metrics": int(os.getenv("PIPELINE_METRICS_WORKERS", "1")),
+    "persist": int(os.getenv("PIPELINE_PERSIST_WORKERS", "1"))
+}
+
+DB_QUERY_PAGE_SIZE = int(os.getenv("DB_QUERY_PAGE_SIZE", "1000"))
+DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "50"))
+DB_WRITE_FLUSH_INTERVAL = float(os.getenv("DB_WRITE_FLUSH_INTERVAL", "2.0"))
+DB_WRITE_RETRY_BACKOFF = 1.0
+DB_SYNC_MAX_BACKOFF = float(os.getenv("DB_SYNC_MAX_BACKOFF", "60"))
+SPOOL_PATH = TEMP_DIR / "spool.db"
+
+RESULT_STORE_MAX_BYTES = int(os.getenv("RESULT_STORE_MAX_MB", "256")) * 1024 * 1024
+RESULT_REBUILD_DELAY_MS = int(os.getenv("RESULT_REBUILD_DELAY_MS", "200"))
+
+SPECULATIVE_ANALYSIS = os.getenv("SPECULATIVE_ANALYSIS", "0") == "1"
+
+PRELOAD_ENABLED = os.getenv("PRELOAD_ENABLED", "1") == "1"
+PRELOAD_MODULES = [
+    "src.utils.frame",
+    "src.analysis.yolo_analyzer",
+    "src.analysis.results",
+    "src.utils.result_store",
+    "supabase",
+    "pandas",
+    "src.utils.chart_renderer"
+] if PRELOAD_ENABLED else []
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "5000"))
+
+RESCORE_PAGE_SIZE = 1000
+RESCORE_WRITE_BATCH_SIZE = 500
+
 POSTURE_CLASSIFICATION_MAP = {
     "Normal-Kanan": "Normal",
     "Normal-Kiri": "Normal",
@@ -3,6 +3,7 @@ from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk
 from pathlib import Path
 import threading
+from src.utils.frame import get_frame
 
 class Dashboard2(tk.Frame):
     def __init__(self, parent, controller):
@@ -11,6 +12,7 @@ class Dashboard2(tk.Frame):
 
         self.uploaded_images = []
         self.model_path = None
+        self.model_ready = False
         self.confidence_threshold = 0.25
 
         self.create_widgets()
@@ -123,6 +125,32 @@ class Dashboard2(tk.Frame):
 
         self.confidence_var.trace_add('write', self.update_confidence_label)
 
+        self.speculative_var = tk.BooleanVar(value=self.controller.speculative_enabled)
+        speculative_check = tk.Checkbutton(confidence_section, text="Analisis spekulatif",
+                                           variable=self.speculative_var,
+                                           font=('Arial', 11), fg='white', bg='#1E1E1E',
+                                           selectcolor='#2E2E2E', activebackground='#1E1E1E',
+                                           command=self.toggle_speculative)
+        speculative_check.pack(side='left', padx=20)
+
+        height_section = tk.Frame(controls_frame, bg='#1E1E1E')
+        height_section.pack(fill='x', padx=20, pady=10)
+
+        height_label = tk.Label(height_section, text="Tinggi Badan (mm):",
+                                font=('Arial', 12, 'bold'), fg='white', bg='#1E1E1E')
+        height_label.pack(side='left', padx=(0, 10))
+
+        self.height_var = tk.StringVar(value=f"{self.controller.user_height:g}")
+        height_entry = tk.Entry(height_section, textvariable=self.height_var, width=10, font=('Arial', 11))
+        height_entry.pack(side='left', padx=10)
+        height_entry.bind('<Return>', lambda e: self.apply_height())
+
+        height_button = tk.Button(height_section, text="Terapkan",
+                                  font=('Arial', 11, 'bold'), bg='#3FB5E5', fg='white',
+                                  relief='flat', padx=15, cursor='hand2',
+                                  command=self.apply_height)
+        height_button.pack(side='left', padx=10)
+
         analyze_button = tk.Button(controls_frame, text="ANALYZE IMAGES",
                                   font=('Arial', 14, 'bold'), bg='#FF5252', fg='white',
                                   relief='flat', padx=40, pady=15,
@@ -158,6 +186,18 @@ class Dashboard2(tk.Frame):
         value = self.confidence_var.get()
         self.confidence_value_label.config(text=f"{value:.2f}")
         self.confidence_threshold = value
+        self.controller.apply_confidence_threshold(value)
+
+    def apply_height(self):
+        try:
+            height = float(self.height_var.get().strip())
+            if height <= 0:
+                raise ValueError("Height must be positive")
+        except ValueError:
+            messagebox.showerror("Error", "Tinggi harus berupa angka positif!")
+            return
+
+        self.controller.apply_user_height(height)
 
     def upload_images(self):
         files = filedialog.askopenfilenames(
@@ -169,6 +209,7 @@ class Dashboard2(tk.Frame):
             self.uploaded_images = list(files)
             self.image_count_label.config(text=f"{len(self.uploaded_images)} images selected")
             self.display_image_previews()
+            self.start_speculation()
 
     def display_image_previews(self):
         for widget in self.preview_inner_frame.winfo_children():
@@ -178,8 +219,7 @@ class Dashboard2(tk.Frame):
 
         for idx, img_path in enumerate(self.uploaded_images):
             try:
-                img = Image.open(img_path)
-                img.thumbnail((150, 150), Image.Resampling.LANCZOS)
+                img = get_frame(img_path).thumbnail((150, 150))
                 photo = ImageTk.PhotoImage(img)
                 self.preview_photos.append(photo)
 
@@ -201,8 +241,40 @@ class Dashboard2(tk.Frame):
 
         if file:
             self.model_path = file
+            self.model_ready = False
+            self.controller.speculate([], None)
             model_name = Path(file).name
-            self.model_status_label.config(text=f"Model: {model_name}", fg='#4CAF50')
+            self.model_status_label.config(text=f"Model: {model_name} (loading...)", fg='#FFC107')
+            self.controller.preload_model(file, self.on_model_status)
+
+    def on_model_status(self, model_path, stage):
+        self.after(0, lambda: self.update_model_status(model_path, stage))
+
+    def update_model_status(self, model_path, stage):
+        if model_path != self.model_path:
+            return
+
+        model_name = Path(model_path).name
+        colors = {"ready": '#4CAF50', "error": '#FF5252'}
+        labels = {"ready": "ready", "error": "failed to load"}
+
+        self.model_status_label.config(text=f"Model: {model_name} ({labels.get(stage, stage + '...')})",
+                                       fg=colors.get(stage, '#FFC107'))
+
+        if stage == "ready":
+            self.model_ready = True
+            self.start_speculation()
+
+    def toggle_speculative(self):
+        self.controller.speculative_enabled = self.speculative_var.get()
+        if self.controller.speculative_enabled:
+            self.start_speculation()
+        else:
+            self.controller.speculate([], None)
+
+    def start_speculation(self):
+        if self.model_ready:
+            self.controller.speculate(self.uploaded_images, self.model_path)
 
     def analyze_single(self):
         messagebox.showinfo("Info", "Mode: Analisis Single Image")
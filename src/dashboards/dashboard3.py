@@ -3,6 +3,10 @@ from tkinter import ttk
 from PIL import Image, ImageTk
 from pathlib import Path
 import cv2
+from src.utils.frame import get_frame
+
+BEFORE_IMAGE_SIZE = (600, 600)
+AFTER_IMAGE_SIZE = (600, 600)
 
 class Dashboard3(tk.Frame):
     def __init__(self, parent, controller):
@@ -100,15 +104,13 @@ class Dashboard3(tk.Frame):
 
         self.display_before_image(result['image_path'])
 
-        if result['annotated_image'] is not None:
-            self.display_after_image(result['annotated_image'])
+        self.display_after_image(result['annotation'].render(AFTER_IMAGE_SIZE))
 
         self.display_summary(result)
 
     def display_before_image(self, image_path):
         try:
-            img = Image.open(image_path)
-            img.thumbnail((600, 600), Image.Resampling.LANCZOS)
+            img = get_frame(image_path).thumbnail(BEFORE_IMAGE_SIZE)
             self.before_photo = ImageTk.PhotoImage(img)
 
             self.before_canvas.delete('all')
@@ -126,7 +128,7 @@ class Dashboard3(tk.Frame):
         try:
             img_rgb = cv2.cvtColor(image_array, cv2.COLOR_BGR2RGB)
             img_pil = Image.fromarray(img_rgb)
-            img_pil.thumbnail((600, 600), Image.Resampling.LANCZOS)
+            img_pil.thumbnail(AFTER_IMAGE_SIZE, Image.Resampling.LANCZOS)
             self.after_photo = ImageTk.PhotoImage(img_pil)
 
             self.after_canvas.delete('all')
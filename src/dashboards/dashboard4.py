@@ -2,15 +2,31 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from PIL import Image, ImageTk
 from pathlib import Path
+import threading
 import cv2
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from src.utils.visualization import PostureVisualizer
+from src.utils.chart_renderer import get_chart_renderer
 from src.utils.export import ResultExporter
 
+ANNOTATED_IMAGE_SIZE = (800, 400)
+
+GRAPH_LAYOUTS = {
+    "back_front_analysis": [("shoulder", "shoulder_imbalance", 0, 0), ("hip", "hip_imbalance", 0, 1),
+                            ("spine", "spine_deviation", 1, 0), ("scapular", None, 1, 1)],
+    "side_analysis": [("head_tilt", "head_tilt", 0, 0), ("foot", None, 0, 1)],
+}
+CHART_CONSTANTS = {"scapular": 118.6}
+
 class Dashboard4(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg='#E8EAF6')
         self.controller = controller
+        self.result_index = 0
+        self.results_generation = None
+        self.chart_renderer = get_chart_renderer()
+        self.chart_labels = {}
+        self.chart_photos = {}
+        self.chart_wanted = {}
+        self.chart_shown = {}
 
         self.create_widgets()
 
@@ -66,6 +82,16 @@ class Dashboard4(tk.Frame):
                                font=('Arial', 14, 'bold'), bg='white', fg='black')
         graphs_title.pack(pady=10)
 
+        nav_frame = tk.Frame(self.graphs_frame, bg='white')
+        nav_frame.pack()
+
+        tk.Button(nav_frame, text="<", font=('Arial', 11, 'bold'), relief='flat', cursor='hand2',
+                  command=lambda: self.show_result(self.result_index - 1)).pack(side='left', padx=5)
+        self.result_label = tk.Label(nav_frame, text="", font=('Arial', 11), bg='white')
+        self.result_label.pack(side='left', padx=5)
+        tk.Button(nav_frame, text=">", font=('Arial', 11, 'bold'), relief='flat', cursor='hand2',
+                  command=lambda: self.show_result(self.result_index + 1)).pack(side='left', padx=5)
+
         self.graphs_container = tk.Frame(self.graphs_frame, bg='white')
         self.graphs_container.pack(fill='both', padx=10, pady=10)
 
@@ -85,7 +111,15 @@ class Dashboard4(tk.Frame):
                                  relief='flat', padx=30, pady=10,
                                  cursor='hand2',
                                  command=self.export_csv)
-        export_button.pack(pady=10)
+        export_button.pack(side='left', padx=10, pady=10, expand=True, anchor='e')
+
+        export_all_button = tk.Button(table_frame, text="Export All Results",
+                                     font=('Arial', 12, 'bold'),
+                                     bg='#3FB5E5', fg='white',
+                                     relief='flat', padx=30, pady=10,
+                                     cursor='hand2',
+                                     command=self.export_all)
+        export_all_button.pack(side='left', padx=10, pady=10, expand=True, anchor='w')
 
         report_frame = tk.Frame(self.scroll_frame, bg='#1E1E1E', relief='solid', bd=2)
         report_frame.pack(fill='x', padx=20, pady=10)
@@ -120,14 +154,24 @@ class Dashboard4(tk.Frame):
         menu_button.pack(side='left', padx=10)
 
     def display_detailed_results(self):
+        if self.results_generation != self.controller.results_generation:
+            self.results_generation = self.controller.results_generation
+            self.result_index = 0
+
+        self.show_result(self.result_index)
+
+    def show_result(self, index):
         analysis_results = self.controller.analysis_results
 
         if not analysis_results:
             return
 
-        result = analysis_results[0]
+        self.result_index = max(0, min(index, len(analysis_results) - 1))
+        self.result_label.config(text=f"{self.result_index + 1} / {len(analysis_results)}")
+
+        result = analysis_results[self.result_index]
 
-        self.display_annotated_image(result['annotated_image'])
+        self.display_annotated_image(result['annotation'].render(ANNOTATED_IMAGE_SIZE))
 
         self.display_graphs(result['metrics'], result['analysis_type'])
 
@@ -139,7 +183,7 @@ class Dashboard4(tk.Frame):
         try:
             img_rgb = cv2.cvtColor(image_array, cv2.COLOR_BGR2RGB)
             img_pil = Image.fromarray(img_rgb)
-            img_pil.thumbnail((800, 400), Image.Resampling.LANCZOS)
+            img_pil.thumbnail(ANNOTATED_IMAGE_SIZE, Image.Resampling.LANCZOS)
             self.annotated_photo = ImageTk.PhotoImage(img_pil)
 
             self.image_canvas.delete('all')
@@ -148,42 +192,40 @@ class Dashboard4(tk.Frame):
             print(f"Error displaying annotated image: {e}")
 
     def display_graphs(self, metrics, analysis_type):
-        for widget in self.graphs_container.winfo_children():
-            widget.destroy()
-
-        visualizer = PostureVisualizer()
-
-        if analysis_type == "back_front_analysis":
-            shoulder_fig = visualizer.create_shoulder_plot(metrics.get('shoulder_imbalance', 0.0))
-            shoulder_canvas = FigureCanvasTkAgg(shoulder_fig, self.graphs_container)
-            shoulder_canvas.draw()
-            shoulder_canvas.get_tk_widget().grid(row=0, column=0, padx=10, pady=10)
-
-            hip_fig = visualizer.create_hip_plot(metrics.get('hip_imbalance', 0.0))
-            hip_canvas = FigureCanvasTkAgg(hip_fig, self.graphs_container)
-            hip_canvas.draw()
-            hip_canvas.get_tk_widget().grid(row=0, column=1, padx=10, pady=10)
-
-            spine_fig = visualizer.create_spine_plot(metrics.get('spine_deviation', 0.0))
-            spine_canvas = FigureCanvasTkAgg(spine_fig, self.graphs_container)
-            spine_canvas.draw()
-            spine_canvas.get_tk_widget().grid(row=1, column=0, padx=10, pady=10)
-
-            scapular_fig = visualizer.create_scapular_plot(118.6)
-            scapular_canvas = FigureCanvasTkAgg(scapular_fig, self.graphs_container)
-            scapular_canvas.draw()
-            scapular_canvas.get_tk_widget().grid(row=1, column=1, padx=10, pady=10)
-
-        elif analysis_type == "side_analysis":
-            head_fig = visualizer.create_head_tilt_plot(metrics.get('head_tilt', 0.0))
-            head_canvas = FigureCanvasTkAgg(head_fig, self.graphs_container)
-            head_canvas.draw()
-            head_canvas.get_tk_widget().grid(row=0, column=0, padx=10, pady=10)
+        layout = GRAPH_LAYOUTS.get(analysis_type, [])
+        visible = {name for name, _, _, _ in layout}
+
+        for name, label in self.chart_labels.items():
+            if name not in visible:
+                label.grid_remove()
+                self.chart_wanted.pop(name, None)
+
+        for name, metric, row, column in layout:
+            value = metrics.get(metric, 0.0) if metric else CHART_CONSTANTS.get(name, 0.0)
+
+            label = self.chart_labels.get(name)
+            if label is None:
+                label = tk.Label(self.graphs_container, bg='white')
+                self.chart_labels[name] = label
+            label.grid(row=row, column=column, padx=10, pady=10)
+
+            key = self.chart_renderer.key(name, value)
+            self.chart_wanted[name] = key
+            image = self.chart_renderer.request(name, value, self.on_chart_rendered)
+            if image is not None:
+                self.show_chart(name, key, image)
+
+    def on_chart_rendered(self, key, image):
+        if image is not None:
+            self.after(0, lambda: self.show_chart(key[0], key, image))
+
+    def show_chart(self, name, key, image):
+        if self.chart_wanted.get(name) != key or self.chart_shown.get(name) == key:
+            return
 
-            foot_fig = visualizer.create_foot_plot()
-            foot_canvas = FigureCanvasTkAgg(foot_fig, self.graphs_container)
-            foot_canvas.draw()
-            foot_canvas.get_tk_widget().grid(row=0, column=1, padx=10, pady=10)
+        self.chart_photos[name] = ImageTk.PhotoImage(Image.fromarray(image, 'RGBA'))
+        self.chart_labels[name].config(image=self.chart_photos[name])
+        self.chart_shown[name] = key
 
     def display_table(self, metrics, analysis_type):
         for widget in self.table_container.winfo_children():
@@ -269,6 +311,34 @@ class Dashboard4(tk.Frame):
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export: {str(e)}")
 
+    def export_all(self):
+        analysis_results = self.controller.analysis_results
+        if not analysis_results:
+            messagebox.showwarning("Warning", "No data to export!")
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"),
+                       ("Arrow files", "*.arrow"), ("All files", "*.*")],
+            initialfile="posture_analysis_batch.csv"
+        )
+
+        if not file_path:
+            return
+
+        def export():
+            try:
+                from src.utils.batch_export import export_results
+                rows = export_results(analysis_results, file_path)
+                self.after(0, lambda: messagebox.showinfo(
+                    "Success", f"{rows} results exported successfully to:\n{file_path}"))
+            except Exception as e:
+                error = str(e)
+                self.after(0, lambda: messagebox.showerror("Error", f"Failed to export: {error}"))
+
+        threading.Thread(target=export, name="batch-export", daemon=True).start()
+
     def back_to_analysis(self):
         self.controller.show_dashboard("dashboard3")
 
@@ -1,15 +1,29 @@
+import time
+
+STARTUP_STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import messagebox
 from pathlib import Path
+import importlib
+import os
 import sys
+import threading
 
 from src.dashboards.dashboard1 import Dashboard1
-from src.dashboards.dashboard2 import Dashboard2
-from src.dashboards.dashboard3 import Dashboard3
-from src.dashboards.dashboard4 import Dashboard4
-from src.analysis.yolo_analyzer import YOLOPostureAnalyzer
-from src.analysis.posture_calculator import PostureCalculator
+from src.analysis.annotation import AnnotatedImage
+from src.analysis.pipeline import AnalysisPipeline, Stage
 from src.utils.database import DatabaseManager
+from src.utils.db_writer import BufferedResultWriter
+from src.config import (INFERENCE_BATCH_SIZE, ANALYSIS_WORKERS, INFERENCE_CONFIDENCE_FLOOR, PIPELINE_STAGE_WORKERS,
+                        PRELOAD_MODULES, SPECULATIVE_ANALYSIS, RESULT_REBUILD_DELAY_MS)
+
+DASHBOARDS = {
+    "dashboard1": ("src.dashboards.dashboard1", "Dashboard1"),
+    "dashboard2": ("src.dashboards.dashboard2", "Dashboard2"),
+    "dashboard3": ("src.dashboards.dashboard3", "Dashboard3"),
+    "dashboard4": ("src.dashboards.dashboard4", "Dashboard4"),
+}
 
 class PostureAnalysisApp(tk.Tk):
     def __init__(self):
@@ -24,30 +38,87 @@ class PostureAnalysisApp(tk.Tk):
         self.uploaded_images = []
         self.model_path = None
         self.confidence_threshold = 0.25
-        self.analysis_results = []
+        self.batch_size = INFERENCE_BATCH_SIZE
+        self.pipeline_workers = dict(PIPELINE_STAGE_WORKERS)
+        if self.pipeline_workers.get("infer", 1) > 1:
+            print(f"Warning: PIPELINE_INFER_WORKERS={self.pipeline_workers['infer']} ignored; the shared YOLO "
+                  "model is not thread-safe, use ANALYSIS_WORKERS for parallel inference")
+            self.pipeline_workers["infer"] = 1
+        self.pipeline_stats = []
+        self.analysis_workers = ANALYSIS_WORKERS
+        self._process_pool = None
+        self._process_pool_key = None
+        self._process_pool_lock = threading.RLock()
+        self.analysis_results = None
+        self.unmatched_raw = []
+        self._results_generation = 0
+        self._rebuild_after = None
+        self._rebuild_thread = None
+        self._rebuild_again = False
+        self.analyzer = None
+        self.analysis_running = False
+        self.inference_floor = INFERENCE_CONFIDENCE_FLOOR
+        self.current_dashboard = None
+        self._model_preload = None
+        self.speculative_enabled = SPECULATIVE_ANALYSIS
+        self._speculation = None
 
         self.db_manager = DatabaseManager()
+        self.result_writer = BufferedResultWriter(self.db_manager)
         self.session_id = None
 
         self.container = tk.Frame(self, bg='black')
         self.container.pack(fill='both', expand=True)
 
         self.frames = {}
-
-        for F in (Dashboard1, Dashboard2, Dashboard3, Dashboard4):
-            frame = F(self.container, self)
-            self.frames[F.__name__.lower()] = frame
-            frame.grid(row=0, column=0, sticky='nsew')
+        self.startup_time = None
 
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
 
+        self._add_dashboard("dashboard1", Dashboard1)
         self.show_dashboard("dashboard1")
 
-    def show_dashboard(self, dashboard_name):
+        self.after_idle(self._on_first_window)
+
+    def _add_dashboard(self, dashboard_name, dashboard_class):
+        frame = dashboard_class(self.container, self)
+        self.frames[dashboard_name] = frame
+        frame.grid(row=0, column=0, sticky='nsew')
+        return frame
+
+    def _get_dashboard(self, dashboard_name):
         frame = self.frames.get(dashboard_name)
+        if frame is None and dashboard_name in DASHBOARDS:
+            start_time = time.perf_counter()
+            module_name, class_name = DASHBOARDS[dashboard_name]
+            dashboard_class = getattr(importlib.import_module(module_name), class_name)
+            frame = self._add_dashboard(dashboard_name, dashboard_class)
+            print(f"Built {class_name} in {(time.perf_counter() - start_time) * 1000:.0f} ms")
+        return frame
+
+    def _on_first_window(self):
+        self.update_idletasks()
+        self.startup_time = time.perf_counter() - STARTUP_STARTED
+        print(f"Startup: first window in {self.startup_time * 1000:.0f} ms")
+
+        threading.Thread(target=self._preload_modules, name="module-preload", daemon=True).start()
+
+    def _preload_modules(self):
+        for module_name in PRELOAD_MODULES:
+            start_time = time.perf_counter()
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                print(f"Preload of {module_name} failed: {e}")
+                continue
+            print(f"Preloaded {module_name} in {(time.perf_counter() - start_time) * 1000:.0f} ms")
+
+    def show_dashboard(self, dashboard_name):
+        frame = self._get_dashboard(dashboard_name)
         if frame:
             frame.tkraise()
+            self.current_dashboard = dashboard_name
 
             if dashboard_name == "dashboard3":
                 self.after(100, lambda: self.frames["dashboard3"].display_results())
@@ -55,8 +126,11 @@ class PostureAnalysisApp(tk.Tk):
                 self.after(100, lambda: self.frames["dashboard4"].display_detailed_results())
 
     def set_user_data(self, name: str, height: float):
+        self.result_writer.flush(wait=False)
+
         self.user_name = name
         self.user_height = height
+        self.clear_results()
 
         self.session_id = self.db_manager.save_user_session(name, height)
 
@@ -71,70 +145,340 @@ class PostureAnalysisApp(tk.Tk):
 
         print(f"Analysis params set: {len(images)} images, confidence: {confidence}")
 
+    def preload_model(self, model_path: str, on_status=None):
+        self.cancel_model_preload()
+
+        if self._speculation is not None and self._speculation.model_path != model_path:
+            self.speculate([], None)
+
+        cancel = threading.Event()
+        self._model_preload = (model_path, cancel)
+
+        def report(stage):
+            if on_status is not None and not cancel.is_set():
+                on_status(model_path, stage)
+
+        def load():
+            start_time = time.perf_counter()
+            try:
+                if self.analysis_workers > 1:
+                    report("starting workers")
+                    self._get_analyzer(model_path)
+                    report("ready")
+                else:
+                    from src.analysis.model_registry import get_model_registry
+                    get_model_registry().get(model_path, progress=report, cancel=cancel)
+            except Exception as e:
+                if cancel.is_set():
+                    print(f"Preload of {Path(model_path).name} cancelled")
+                    return
+                print(f"Model preload error: {e}")
+                report("error")
+                return
+            print(f"Preloaded model {Path(model_path).name} in {time.perf_counter() - start_time:.2f}s")
+
+        threading.Thread(target=load, name="model-preload", daemon=True).start()
+
+    def cancel_model_preload(self):
+        if self._model_preload is not None:
+            self._model_preload[1].set()
+            self._model_preload = None
+
+    def speculate(self, images: list, model_path: str):
+        previous = self._speculation
+        if previous is not None:
+            previous.cancel()
+            self._speculation = None
+
+        if not self.speculative_enabled or not images or not model_path or self.analysis_running:
+            return
+
+        from src.analysis.speculative import SpeculativeAnalysis
+
+        self._speculation = SpeculativeAnalysis(images, model_path, self._confidence_floor(),
+                                                self._get_analyzer, batch_size=self.batch_size,
+                                                previous=previous)
+        self._speculation.start()
+        print(f"Speculative analysis started for {len(images)} images")
+
+    def _take_speculation(self) -> dict:
+        speculation = self._speculation
+        self._speculation = None
+        if speculation is None:
+            return {}
+
+        speculation.cancel(wait=True)
+        if not speculation.matches(self.model_path, self.inference_floor):
+            return {}
+
+        wanted = set(self.uploaded_images)
+        return {image_path: result for image_path, result in speculation.results().items() if image_path in wanted}
+
+    def _confidence_floor(self) -> float:
+        return min(INFERENCE_CONFIDENCE_FLOOR, self.confidence_threshold)
+
     def run_analysis(self):
         if not self.uploaded_images or not self.model_path:
             raise ValueError("Missing images or model")
 
         print("Starting analysis...")
 
+        self.analysis_running = True
         try:
-            analyzer = YOLOPostureAnalyzer(self.model_path)
-            calculator = PostureCalculator(self.user_height)
+            analyzer = self._get_analyzer()
+            self.analyzer = analyzer
+
+            self._results_generation += 1
+            if self.analysis_results is None:
+                from src.utils.result_store import ResultStore
+                self.analysis_results = ResultStore()
+            self.analysis_results.clear()
+            self.inference_floor = self._confidence_floor()
+
+            speculated = self._take_speculation()
+            print(f"Analyzing {len(self.uploaded_images)} images (batch size: {self.batch_size}, "
+                  f"{len(speculated)} already inferred speculatively)")
+
+            pipeline = self._build_pipeline(analyzer, speculated)
+            items = pipeline.run({"image_path": image_path} for image_path in self.uploaded_images)
+            pipeline.report()
+            self.pipeline_stats = pipeline.stats()
+
+            self.analysis_results.replace(item["result"] for item in items if item.get("result"))
+            self.unmatched_raw = [(item["image_path"], item["raw"], item["elapsed"])
+                                  for item in items if not item.get("result")]
 
-            self.analysis_results = []
+            print(f"Total results: {len(self.analysis_results)}")
+            self.result_writer.flush(wait=False)
+
+        except Exception as e:
+            print(f"Analysis error: {e}")
+            raise
+        finally:
+            self.analysis_running = False
+
+    def _build_pipeline(self, analyzer, speculated: dict) -> AnalysisPipeline:
+        from src.analysis.results import build_results
+        from src.utils.frame import get_frame
+
+        workers = self.pipeline_workers
+
+        def decode(item):
+            if item["image_path"] in speculated:
+                return item
+            item["frame"] = get_frame(item["image_path"])
+            item["frame"].bgr
+            return item
+
+        def infer(items):
+            pending = []
+            for item in items:
+                if item["image_path"] in speculated:
+                    item["raw"], item["elapsed"] = speculated[item["image_path"]]
+                else:
+                    pending.append(item)
+
+            if pending:
+                inferred = analyzer.infer_batch([item["frame"] for item in pending], self.inference_floor,
+                                                batch_size=len(pending))
+                for item, (_, raw, elapsed) in zip(pending, inferred):
+                    item["raw"] = raw
+                    item["elapsed"] = elapsed
+            return items
+
+        def metrics(item):
+            results = build_results([(item["image_path"], item["raw"], item["elapsed"])],
+                                    self.confidence_threshold, self.user_height)
+            item["result"] = results[0] if results else None
+            if item["result"] is not None:
+                item["result"]["annotation"] = self._lazy_annotation(item["result"])
+            item.pop("frame", None)
+            return item
+
+        def persist(item):
+            result = item["result"]
+            if result is not None:
+                if self.session_id:
+                    self.result_writer.submit(self.session_id, {
+                        "analysis_type": result["analysis_type"],
+                        "classification": result["classification"],
+                        "confidence": result["confidence"],
+                        "score": result["score"],
+                        "measurements": result["metrics"],
+                        "keypoints": result["keypoints"]
+                    })
+
+                print(f"Analysis complete: {result['classification']} (Confidence: {result['confidence']:.2%})")
+            return item
+
+        return AnalysisPipeline([
+            Stage("decode", decode, workers.get("decode", 1)),
+            Stage("infer", infer, workers.get("infer", 1), batch_size=self.batch_size),
+            Stage("metrics", metrics, workers.get("metrics", 1)),
+            Stage("persist", persist, workers.get("persist", 1)),
+        ])
+
+    def apply_confidence_threshold(self, confidence: float):
+        self.confidence_threshold = confidence
 
-            for image_path in self.uploaded_images:
-                print(f"Analyzing: {image_path}")
+        speculation = self._speculation
+        if speculation is not None and not speculation.matches(speculation.model_path, self._confidence_floor()):
+            self.speculate(speculation.images, speculation.model_path)
 
-                analysis_data = analyzer.analyze_image(image_path, self.confidence_threshold)
+        if not self._has_analyses() or self.analysis_running:
+            return
 
-                if analysis_data["detections"]:
-                    detection = analysis_data["detections"][0]
-                    classification = detection["classification"]
-                    confidence = detection["confidence"]
-                    keypoints = detection["keypoints"]
+        if confidence < self.inference_floor:
+            print(f"Confidence {confidence:.2f} is below the inference floor {self.inference_floor:.2f}; "
+                  "run the analysis again to include weaker detections")
+            return
 
-                    analysis_type = calculator.determine_analysis_type(classification)
+        self._schedule_rebuild()
 
-                    metrics = calculator.calculate_posture_metrics(keypoints, analysis_type)
+    def apply_user_height(self, height: float):
+        self.user_height = height
 
-                    annotated_image = analyzer.annotate_image(image_path, analysis_data)
+        if self._has_analyses() and not self.analysis_running:
+            self._schedule_rebuild()
 
-                    result = {
-                        "image_path": image_path,
-                        "classification": classification,
-                        "confidence": confidence,
-                        "analysis_type": analysis_type,
-                        "metrics": metrics,
-                        "score": metrics.get("score", 0.0),
-                        "analysis_data": analysis_data,
-                        "annotated_image": annotated_image
-                    }
+    @property
+    def results_generation(self) -> int:
+        return self._results_generation
 
-                    self.analysis_results.append(result)
+    def clear_results(self):
+        self._results_generation += 1
+        if self._rebuild_after is not None:
+            self.after_cancel(self._rebuild_after)
+            self._rebuild_after = None
 
-                    if self.session_id:
-                        self.db_manager.save_analysis_result(self.session_id, {
-                            "analysis_type": analysis_type,
-                            "classification": classification,
-                            "confidence": confidence,
-                            "score": metrics.get("score", 0.0),
-                            "measurements": metrics,
-                            "keypoints": keypoints
-                        })
+        self.unmatched_raw = []
+        if self.analysis_results is not None:
+            self.analysis_results.clear()
 
-                    print(f"Analysis complete: {classification} (Confidence: {confidence:.2%})")
+    def _schedule_rebuild(self):
+        if self._rebuild_after is not None:
+            self.after_cancel(self._rebuild_after)
+        self._rebuild_after = self.after(RESULT_REBUILD_DELAY_MS, self._start_rebuild)
 
-            print(f"Total results: {len(self.analysis_results)}")
+    def _start_rebuild(self):
+        self._rebuild_after = None
 
+        if self._rebuild_thread is not None:
+            self._rebuild_again = True
+            return
+
+        args = (self._results_generation, self.analysis_results, self.unmatched_raw,
+                self.confidence_threshold, self.user_height)
+        self._rebuild_thread = threading.Thread(target=self._rebuild_results, args=args,
+                                                name="result-rebuild", daemon=True)
+        self._rebuild_thread.start()
+
+    def _rebuild_results(self, generation, store, unmatched_raw, confidence, height):
+        from src.analysis.results import build_results
+        from src.utils.result_store import ResultStore
+
+        start_time = time.time()
+
+        try:
+            previous = {store.compact(idx)["image_path"]: idx for idx in range(len(store))}
+            raw_analyses = self._raw_analyses(store, unmatched_raw)
+            results = build_results(raw_analyses, confidence, height)
+
+            for result in results:
+                idx = previous.get(result["image_path"])
+                old = store.resident(idx) if idx is not None else None
+                if old is not None and old["detection_count"] == result["detection_count"]:
+                    result["annotation"] = old["annotation"]
+                else:
+                    result["annotation"] = self._lazy_annotation(result)
+
+            matched = {result["image_path"] for result in results}
+            rebuilt = ResultStore()
+            rebuilt.extend(results)
+            unmatched = [item for item in raw_analyses if item[0] not in matched]
         except Exception as e:
-            print(f"Analysis error: {e}")
-            raise
+            if generation == self._results_generation:
+                print(f"Error rebuilding results: {e}")
+            self.after(0, lambda: self._finish_rebuild(generation, None, None))
+            return
+
+        print(f"Results rebuilt in {(time.time() - start_time) * 1000:.1f} ms "
+              f"(confidence {confidence:.2f}, height {height} mm)")
+        self.after(0, lambda: self._finish_rebuild(generation, rebuilt, unmatched))
+
+    def _finish_rebuild(self, generation, rebuilt, unmatched):
+        self._rebuild_thread = None
+
+        if rebuilt is not None:
+            if generation != self._results_generation or self.analysis_running:
+                rebuilt.clear()
+            else:
+                previous = self.analysis_results
+                self.analysis_results = rebuilt
+                self.unmatched_raw = unmatched
+                threading.Thread(target=previous.clear, name="result-store-clear", daemon=True).start()
+                self._refresh_result_dashboards()
+
+        if self._rebuild_again:
+            self._rebuild_again = False
+            if self._has_analyses() and not self.analysis_running:
+                self._start_rebuild()
+
+    def _has_analyses(self) -> bool:
+        return bool(self.unmatched_raw) or bool(self.analysis_results)
+
+    def _raw_analyses(self, store, unmatched_raw) -> list:
+        raw_analyses = [store.raw_analysis(idx) for idx in range(len(store))] + unmatched_raw
+        order = {image_path: idx for idx, image_path in enumerate(self.uploaded_images)}
+        return sorted(raw_analyses, key=lambda item: order.get(item[0], len(order)))
+
+    def _lazy_annotation(self, result: dict) -> AnnotatedImage:
+        return AnnotatedImage(result["image_path"], result["analysis_data"], self.analyzer.annotate_image)
+
+    def _refresh_result_dashboards(self):
+        if self.current_dashboard in ("dashboard3", "dashboard4"):
+            self.show_dashboard(self.current_dashboard)
+
+    def _get_analyzer(self, model_path=None):
+        model_path = model_path or self.model_path
+
+        if self.analysis_workers <= 1:
+            from src.analysis.yolo_analyzer import YOLOPostureAnalyzer
+            return YOLOPostureAnalyzer(model_path)
+
+        from src.analysis.model_registry import get_model_registry
+        from src.analysis.parallel import ProcessPoolAnalyzer
+
+        with self._process_pool_lock:
+            key = (model_path, get_model_registry().file_digest(model_path), self.analysis_workers)
+            if self._process_pool is None or self._process_pool_key != key:
+                self._close_process_pool()
+                self._process_pool = ProcessPoolAnalyzer(model_path, workers=self.analysis_workers)
+                self._process_pool_key = key
+
+            return self._process_pool
+
+    def _close_process_pool(self):
+        with self._process_pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.close()
+                self._process_pool = None
+                self._process_pool_key = None
+
+    def shutdown(self):
+        self.cancel_model_preload()
+        self.speculate([], None)
+        self.result_writer.close(timeout=30)
+        self._close_process_pool()
+        if self.analysis_results is not None:
+            self.analysis_results.clear()
 
 def main():
+    os.environ.setdefault("MPLBACKEND", "TkAgg")
     try:
         app = PostureAnalysisApp()
         app.mainloop()
+        app.shutdown()
     except Exception as e:
         print(f"Application error: {e}")
         messagebox.showerror("Error", f"Failed to start application: {str(e)}")
@@ -0,0 +1,218 @@
+import argparse
+import csv
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from src.config import KEYPOINT_NAMES, EXPORT_CHUNK_SIZE, DB_QUERY_PAGE_SIZE
+from src.utils.database import DatabaseManager, PACKED_KEYPOINT_DTYPE, PACKED_MEASUREMENT_KEYS
+
+EXPORT_FORMATS = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+KEYPOINT_COLUMNS = [f"{KEYPOINT_NAMES[idx]}_{axis}"
+                    for idx in range(len(KEYPOINT_NAMES)) for axis in ("x", "y", "conf")]
+MEASUREMENT_COLUMNS = list(PACKED_MEASUREMENT_KEYS)
+
+RESULT_STRING_COLUMNS = ["image_path", "classification", "analysis_type"]
+QUERY_STRING_COLUMNS = ["id", "session_id", "created_at", "classification", "analysis_type"]
+FLOAT_COLUMNS = ["confidence"] + MEASUREMENT_COLUMNS + KEYPOINT_COLUMNS
+
+KEYPOINT_DECIMALS = 4
+
+QUERY_COLUMNS = ("id, session_id, created_at, analysis_type, classification, confidence, "
+                 "measurements_packed, keypoints_packed")
+
+
+class ColumnarWriter:
+    def __init__(self, path: str, string_columns: List[str], float_columns: List[str] = FLOAT_COLUMNS):
+        self.path = Path(path)
+        self.format = EXPORT_FORMATS.get(self.path.suffix.lower(), "csv")
+        self.string_columns = list(string_columns)
+        self.float_columns = list(float_columns)
+        self.columns = self.string_columns + self.float_columns
+        self.rows = 0
+
+        self._file = None
+        self._writer = None
+
+        try:
+            import pyarrow
+        except ImportError:
+            if self.format != "csv":
+                raise RuntimeError(f"{self.format.capitalize()} export requires pyarrow (pip install pyarrow)")
+            pyarrow = None
+        self._pa = pyarrow
+
+        self._open()
+
+    def write(self, chunk: Dict[str, Sequence]):
+        count = len(chunk[self.columns[0]])
+        if not count:
+            return
+
+        if self._pa is None:
+            self._write_csv_fallback(chunk, count)
+        else:
+            self._writer.write_table(self._to_table(chunk))
+
+        self.rows += count
+
+    def close(self):
+        if self._writer is not None and self._pa is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        if self._pa is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8-sig")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.columns)
+            return
+
+        pa = self._pa
+        schema = self._schema()
+
+        if self.format == "parquet":
+            import pyarrow.parquet
+            self._writer = pyarrow.parquet.ParquetWriter(str(self.path), schema)
+        elif self.format == "arrow":
+            self._writer = pa.ipc.new_file(str(self.path), schema)
+        else:
+            import pyarrow.csv
+            self._file = open(self.path, "wb")
+            self._file.write("\ufeff".encode("utf-8"))
+            self._writer = pyarrow.csv.CSVWriter(pa.PythonFile(self._file, mode="w"), schema)
+
+    def _schema(self):
+        pa = self._pa
+        fields = [pa.field(name, pa.string()) for name in self.string_columns]
+        fields.extend(pa.field(name, pa.float64()) for name in self.float_columns)
+        return pa.schema(fields)
+
+    def _to_table(self, chunk: Dict[str, Sequence]):
+        pa = self._pa
+        arrays = [pa.array(chunk[name], type=pa.string()) for name in self.string_columns]
+        arrays.extend(pa.array(np.asarray(chunk[name], dtype=np.float64), from_pandas=True)
+                      for name in self.float_columns)
+        return pa.Table.from_arrays(arrays, schema=self._schema())
+
+    def _write_csv_fallback(self, chunk: Dict[str, Sequence], count: int):
+        columns = [chunk[name] for name in self.string_columns]
+        for name in self.float_columns:
+            values = np.asarray(chunk[name], dtype=np.float64)
+            missing = np.isnan(values)
+            if missing.any():
+                values = values.astype(object)
+                values[missing] = None
+            columns.append(values.tolist())
+        self._writer.writerows(zip(*columns))
+        self._file.flush()
+
+
+def _keypoint_columns(keypoints: np.ndarray) -> Dict[str, np.ndarray]:
+    flat = np.round(keypoints.reshape(len(keypoints), -1).astype(np.float64), KEYPOINT_DECIMALS)
+    return {name: flat[:, idx] for idx, name in enumerate(KEYPOINT_COLUMNS)}
+
+
+def result_columns(results: Sequence[Dict]) -> Dict[str, Sequence]:
+    count = len(results)
+    keypoints = np.zeros((count, len(KEYPOINT_NAMES), 3), dtype=np.float32)
+    measurements = np.full((count, len(MEASUREMENT_COLUMNS)), np.nan)
+
+    for idx, result in enumerate(results):
+        keypoints[idx] = result["keypoints"].array
+        metrics = result.get("metrics") or {}
+        for col, key in enumerate(MEASUREMENT_COLUMNS):
+            value = metrics.get(key)
+            if value is not None:
+                measurements[idx, col] = value
+
+    chunk = {name: [result[name] for result in results] for name in RESULT_STRING_COLUMNS}
+    chunk["confidence"] = np.fromiter((result["confidence"] for result in results), np.float64, count)
+    chunk.update({name: measurements[:, col] for col, name in enumerate(MEASUREMENT_COLUMNS)})
+    chunk.update(_keypoint_columns(keypoints))
+    return chunk
+
+
+def query_columns(rows: List[Dict]) -> Dict[str, Sequence]:
+    count = len(rows)
+    packed = [row.get("keypoints_packed") for row in rows]
+
+    keypoints = np.zeros((count, len(KEYPOINT_NAMES), 3), dtype=np.float32)
+    if all(isinstance(value, str) for value in packed):
+        raw = bytes.fromhex("".join(value[2:] if value.startswith("\\x") else value for value in packed))
+        keypoints[:] = np.frombuffer(raw, dtype=PACKED_KEYPOINT_DTYPE).reshape(keypoints.shape)
+    else:
+        for idx, row in enumerate(rows):
+            keypoints[idx] = DatabaseManager.decode_keypoints(row).array
+
+    if all(row.get("measurements_packed") is not None for row in rows):
+        measurements = np.array([row["measurements_packed"] for row in rows], dtype=np.float64)
+    else:
+        measurements = np.array([[DatabaseManager.decode_measurements(row).get(key, np.nan)
+                                  for key in MEASUREMENT_COLUMNS] for row in rows], dtype=np.float64)
+    measurements = measurements.reshape(count, len(MEASUREMENT_COLUMNS))
+
+    chunk = {name: [row.get(name) for row in rows] for name in QUERY_STRING_COLUMNS}
+    chunk["confidence"] = np.array([row.get("confidence") for row in rows], dtype=np.float64)
+    chunk.update({name: measurements[:, col] for col, name in enumerate(MEASUREMENT_COLUMNS)})
+    chunk.update(_keypoint_columns(keypoints))
+    return chunk
+
+
+def iter_result_chunks(results, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    compact = getattr(results, "compact", None)
+
+    for offset in range(0, len(results), chunk_size):
+        indices = range(offset, min(offset + chunk_size, len(results)))
+        yield [compact(idx) for idx in indices] if compact else [results[idx] for idx in indices]
+
+
+def export_results(results, path: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> int:
+    with ColumnarWriter(path, RESULT_STRING_COLUMNS) as writer:
+        for chunk in iter_result_chunks(results, chunk_size):
+            writer.write(result_columns(chunk))
+    return writer.rows
+
+
+def export_query(db_manager: DatabaseManager, path: str, page_size: int = DB_QUERY_PAGE_SIZE,
+                 progress=None, **filters) -> int:
+    with ColumnarWriter(path, QUERY_STRING_COLUMNS) as writer:
+        for rows in db_manager.iter_analysis_pages(QUERY_COLUMNS, page_size, **filters):
+            writer.write(query_columns(rows))
+            if progress is not None:
+                progress(writer.rows)
+    return writer.rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export stored analysis results as one columnar table")
+    parser.add_argument("output", help="Output .csv, .parquet or .arrow file")
+    parser.add_argument("--session", help="Only export this session id")
+    parser.add_argument("--classification")
+    parser.add_argument("--since", help="Only results created at or after this timestamp")
+    parser.add_argument("--until", help="Only results created before this timestamp")
+    parser.add_argument("--page-size", type=int, default=DB_QUERY_PAGE_SIZE)
+    args = parser.parse_args(argv)
+
+    db_manager = DatabaseManager()
+    if not db_manager.connected:
+        raise SystemExit("Database is not connected")
+
+    rows = export_query(db_manager, args.output, args.page_size,
+                        progress=lambda count: print(f"{count} rows exported"),
+                        session_id=args.session, classification=args.classification,
+                        since=args.since, until=args.until)
+    print(f"Wrote {rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
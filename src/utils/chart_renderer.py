@@ -0,0 +1,117 @@
+import queue
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from src.config import CHART_CACHE_MAX_BYTES
+from src.utils.visualization import PostureChart, PostureVisualizer
+
+CHART_QUANTUM = {
+    "shoulder": 1.0,
+    "hip": 1.0,
+    "spine": 1.0,
+    "head_tilt": 0.1,
+    "scapular": 0.1,
+    "foot": 0.0,
+}
+
+ChartKey = Tuple[str, float]
+
+
+class ChartRenderer:
+    def __init__(self, max_bytes: int = CHART_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+        self._images: "OrderedDict[ChartKey, np.ndarray]" = OrderedDict()
+        self._pending: Dict[ChartKey, List[Callable]] = {}
+        self._charts: Dict[str, PostureChart] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[ChartKey]" = queue.Queue()
+        self._thread = None
+
+    @staticmethod
+    def key(name: str, value: float) -> ChartKey:
+        quantum = CHART_QUANTUM.get(name, 0.1)
+        if not quantum:
+            return (name, 0.0)
+        return (name, round(round(float(value) / quantum) * quantum, 6))
+
+    def request(self, name: str, value: float,
+                callback: Callable[[ChartKey, Optional[np.ndarray]], None]) -> Optional[np.ndarray]:
+        key = self.key(name, value)
+
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+
+            callbacks = self._pending.get(key)
+            if callbacks is not None:
+                callbacks.append(callback)
+                return None
+            self._pending[key] = [callback]
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="chart-render", daemon=True)
+                self._thread.start()
+
+        self._queue.put(key)
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self.nbytes = 0
+
+    def _run(self):
+        while True:
+            key = self._queue.get()
+
+            try:
+                image = self._render(key)
+            except Exception as e:
+                print(f"Error rendering {key[0]} chart: {e}")
+                image = None
+
+            with self._lock:
+                callbacks = self._pending.pop(key, [])
+                if image is not None:
+                    self._store(key, image)
+
+            for callback in callbacks:
+                callback(key, image)
+
+    def _render(self, key: ChartKey) -> np.ndarray:
+        name, value = key
+
+        chart = self._charts.get(name)
+        if chart is None:
+            chart = PostureVisualizer.create_chart(name, value)
+            FigureCanvasAgg(chart.figure)
+            self._charts[name] = chart
+        else:
+            chart.update(value)
+
+        canvas = chart.figure.canvas
+        canvas.draw()
+        return np.array(canvas.buffer_rgba(), dtype=np.uint8)
+
+    def _store(self, key: ChartKey, image: np.ndarray):
+        self._images[key] = image
+        self.nbytes += image.nbytes
+
+        while self.nbytes > self.max_bytes and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+
+_chart_renderer = ChartRenderer()
+
+
+def get_chart_renderer() -> ChartRenderer:
+    return _chart_renderer
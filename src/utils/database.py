@@ -1,62 +1,263 @@
-from supabase import create_client, Client
 from datetime import datetime
+from typing import Dict, Iterator, List, Optional
 import json
-from src.config import SUPABASE_URL, SUPABASE_KEY
+import threading
+import uuid
+import numpy as np
+from src.analysis.detections import Keypoints
+from src.config import SUPABASE_URL, SUPABASE_KEY, DB_QUERY_PAGE_SIZE
+from src.utils.spool import LocalSpool
+
+RESULT_SUMMARY_COLUMNS = "id, session_id, created_at, analysis_type, classification, confidence, score"
+TREND_COLUMNS = "day, classification, result_count, score_count, score_sum, score_mean, score_min, score_max"
+PACKED_KEYPOINT_DTYPE = np.dtype(">f4")
+PACKED_MEASUREMENT_KEYS = ("ratio", "shoulder_imbalance", "hip_imbalance", "spine_deviation",
+                           "shoulder_angle", "hip_angle", "head_shift", "head_tilt", "score")
 
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, spool: Optional[LocalSpool] = None):
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.spool = spool if spool is not None else LocalSpool()
+
         if SUPABASE_URL and SUPABASE_KEY:
-            self.client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
             self.connected = True
         else:
-            self.client = None
             self.connected = False
-            print("Warning: Supabase credentials not found. Database features disabled.")
+            print("Warning: Supabase credentials not found. Results are kept in the local spool until configured.")
+
+    @property
+    def client(self):
+        if self._client is None and self.connected:
+            with self._client_lock:
+                if self._client is None:
+                    from supabase import create_client
+                    self._client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        return self._client
 
     def save_user_session(self, name: str, height: float):
+        data = {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "height": height,
+            "created_at": datetime.now().isoformat()
+        }
+        self.spool.add("user_sessions", data)
+        return data["id"]
+
+    def save_analysis_result(self, session_id: str, analysis_data: dict):
+        data = self.build_analysis_row(session_id, analysis_data)
+        self.spool.add("analysis_results", data)
+        return data["id"]
+
+    def push_rows(self, table: str, rows: List[Dict]) -> int:
+        if not self.connected or not rows:
+            return 0
+
+        result = self.client.table(table).upsert(rows, on_conflict="id", ignore_duplicates=True).execute()
+        return len(result.data) if result.data else 0
+
+    def build_analysis_row(self, session_id: str, analysis_data: dict) -> Dict:
+        return {
+            "id": str(uuid.uuid4()),
+            "session_id": session_id,
+            "analysis_type": analysis_data.get("analysis_type"),
+            "classification": analysis_data.get("classification"),
+            "confidence": analysis_data.get("confidence"),
+            "score": analysis_data.get("score"),
+            "measurements_packed": self.encode_measurements(analysis_data.get("measurements", {})),
+            "keypoints_packed": self.encode_keypoints(analysis_data.get("keypoints")),
+            "created_at": datetime.now().isoformat()
+        }
+
+    def get_session_results(self, session_id: str, columns: str = RESULT_SUMMARY_COLUMNS):
         if not self.connected:
-            return None
+            return []
 
         try:
-            data = {
-                "name": name,
-                "height": height,
-                "created_at": datetime.now().isoformat()
-            }
-            result = self.client.table("user_sessions").insert(data).execute()
-            return result.data[0]["id"] if result.data else None
+            return list(self.stream_analysis_results(columns, session_id=session_id))
         except Exception as e:
-            print(f"Error saving user session: {e}")
-            return None
+            print(f"Error fetching session results: {e}")
+            return []
 
-    def save_analysis_result(self, session_id: str, analysis_data: dict):
+    def stream_analysis_results(self, columns: str = RESULT_SUMMARY_COLUMNS, page_size: int = DB_QUERY_PAGE_SIZE,
+                                decode: bool = False, **filters) -> Iterator[Dict]:
+        for rows in self.iter_analysis_pages(columns, page_size, **filters):
+            for row in rows:
+                yield self.decode_analysis_row(row) if decode else row
+
+    def iter_analysis_pages(self, columns: str = "*", page_size: int = DB_QUERY_PAGE_SIZE,
+                            session_id: Optional[str] = None, classification: Optional[str] = None,
+                            since: Optional[str] = None, until: Optional[str] = None,
+                            limit: Optional[int] = None) -> Iterator[List[Dict]]:
+        if not self.connected:
+            return
+
+        columns = self._with_cursor_columns(columns)
+        remaining = limit
+        cursor = None
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+
+            query = self.client.table("analysis_results").select(columns)
+            if session_id is not None:
+                query = query.eq("session_id", session_id)
+            if classification is not None:
+                query = query.eq("classification", classification)
+            if since is not None:
+                query = query.gte("created_at", since)
+            if until is not None:
+                query = query.lt("created_at", until)
+            if cursor is not None:
+                created_at, row_id = cursor
+                query = query.lte("created_at", created_at).or_(f'created_at.lt."{created_at}",'
+                                  f'and(created_at.eq."{created_at}",id.lt.{row_id})')
+
+            result = query.order("created_at", desc=True).order("id", desc=True).limit(size).execute()
+            rows = result.data or []
+            if not rows:
+                return
+
+            yield rows
+
+            if len(rows) < size:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            cursor = (rows[-1]["created_at"], rows[-1]["id"])
+
+    @staticmethod
+    def _with_cursor_columns(columns: str) -> str:
+        selected = [column.strip() for column in columns.split(",")]
+        if "*" in selected:
+            return columns
+
+        missing = [column for column in ("created_at", "id") if column not in selected]
+        return ", ".join(missing + [columns]) if missing else columns
+
+    def get_person_sessions(self, name: str, columns: str = "id, name, height, created_at",
+                            limit: int = 100) -> List[Dict]:
         if not self.connected:
-            return None
+            return []
 
         try:
-            data = {
-                "session_id": session_id,
-                "analysis_type": analysis_data.get("analysis_type"),
-                "classification": analysis_data.get("classification"),
-                "confidence": analysis_data.get("confidence"),
-                "score": analysis_data.get("score"),
-                "measurements": json.dumps(analysis_data.get("measurements", {})),
-                "keypoints": json.dumps(analysis_data.get("keypoints", {})),
-                "created_at": datetime.now().isoformat()
-            }
-            result = self.client.table("analysis_results").insert(data).execute()
-            return result.data[0]["id"] if result.data else None
+            result = (self.client.table("user_sessions").select(columns)
+                      .eq("person_key", self.person_key(name))
+                      .order("created_at", desc=True).limit(limit).execute())
+            return result.data if result.data else []
         except Exception as e:
-            print(f"Error saving analysis result: {e}")
-            return None
+            print(f"Error fetching person sessions: {e}")
+            return []
 
-    def get_session_results(self, session_id: str):
+    def get_person_trend(self, name: str, since: Optional[str] = None, until: Optional[str] = None,
+                         classification: Optional[str] = None) -> List[Dict]:
         if not self.connected:
             return []
 
         try:
-            result = self.client.table("analysis_results").select("*").eq("session_id", session_id).execute()
+            query = self.client.table("person_daily_trends").select(TREND_COLUMNS).eq("person_key", self.person_key(name))
+            if classification is not None:
+                query = query.eq("classification", classification)
+            if since is not None:
+                query = query.gte("day", since)
+            if until is not None:
+                query = query.lt("day", until)
+
+            result = query.order("day").order("classification").execute()
             return result.data if result.data else []
         except Exception as e:
-            print(f"Error fetching session results: {e}")
+            print(f"Error fetching person trend: {e}")
             return []
+
+    @staticmethod
+    def combine_trend_days(rows: List[Dict]) -> List[Dict]:
+        days: Dict[str, Dict] = {}
+
+        for row in rows:
+            count = int(row["result_count"])
+            day = days.setdefault(row["day"], {"day": row["day"], "result_count": 0, "score_count": 0,
+                                                "score_sum": 0.0, "score_min": None, "score_max": None,
+                                                "classifications": {}})
+            day["result_count"] += count
+            day["score_count"] += int(row["score_count"])
+            day["score_sum"] += float(row["score_sum"] or 0.0)
+            day["classifications"][row["classification"]] = count
+
+            for key, pick in (("score_min", min), ("score_max", max)):
+                if row[key] is not None:
+                    value = float(row[key])
+                    day[key] = value if day[key] is None else pick(day[key], value)
+
+        combined = []
+        for day in sorted(days):
+            entry = days[day]
+            score_count = entry.pop("score_count")
+            entry["score_mean"] = round(entry.pop("score_sum") / score_count, 2) if score_count else None
+            combined.append(entry)
+
+        return combined
+
+    @staticmethod
+    def person_key(name: str) -> str:
+        return " ".join(name.split()).lower()
+
+    def update_analysis_results(self, rows: List[Dict]) -> int:
+        if not self.connected or not rows:
+            return 0
+
+        try:
+            result = self.client.table("analysis_results").upsert(rows, on_conflict="id").execute()
+            return len(result.data) if result.data else 0
+        except Exception as e:
+            print(f"Error updating analysis results: {e}")
+            return 0
+
+    @staticmethod
+    def encode_measurements(measurements: Dict) -> List[Optional[float]]:
+        return [float(measurements[key]) if measurements.get(key) is not None else None
+                for key in PACKED_MEASUREMENT_KEYS]
+
+    @staticmethod
+    def decode_measurements(row: Dict) -> Dict:
+        packed = row.get("measurements_packed")
+        if packed is None:
+            return DatabaseManager.decode_json_column(row.get("measurements"), {})
+
+        return {key: float(value) for key, value in zip(PACKED_MEASUREMENT_KEYS, packed) if value is not None}
+
+    @staticmethod
+    def encode_keypoints(keypoints) -> str:
+        data = Keypoints.coerce(keypoints).array.astype(PACKED_KEYPOINT_DTYPE)
+        return "\\x" + data.tobytes().hex()
+
+    @staticmethod
+    def decode_keypoints(row: Dict) -> Keypoints:
+        packed = row.get("keypoints_packed")
+        if packed is None:
+            return Keypoints.coerce(DatabaseManager.decode_json_column(row.get("keypoints"), {}))
+
+        if isinstance(packed, str):
+            packed = bytes.fromhex(packed[2:] if packed.startswith("\\x") else packed)
+
+        data = np.frombuffer(bytes(packed), dtype=PACKED_KEYPOINT_DTYPE).reshape(-1, 3)
+        return Keypoints(data.astype(np.float32))
+
+    @staticmethod
+    def decode_analysis_row(row: Dict) -> Dict:
+        decoded = dict(row)
+        if "keypoints_packed" in row or "keypoints" in row:
+            decoded.pop("keypoints_packed", None)
+            decoded["keypoints"] = DatabaseManager.decode_keypoints(row)
+        if "measurements_packed" in row or "measurements" in row:
+            decoded.pop("measurements_packed", None)
+            decoded["measurements"] = DatabaseManager.decode_measurements(row)
+        return decoded
+
+    @staticmethod
+    def decode_json_column(value, default=None):
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return default
+        return value if value is not None else default
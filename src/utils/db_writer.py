@@ -0,0 +1,186 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.config import DB_WRITE_BATCH_SIZE, DB_WRITE_FLUSH_INTERVAL, DB_WRITE_RETRY_BACKOFF, DB_SYNC_MAX_BACKOFF
+
+SYNC_TABLES = ("user_sessions", "analysis_results")
+REJECTED_ERROR_CODES = ("22", "23", "42", "PGRST1", "PGRST2")
+
+
+class BufferedResultWriter:
+    def __init__(self, db_manager, batch_size: int = DB_WRITE_BATCH_SIZE,
+                 flush_interval: float = DB_WRITE_FLUSH_INTERVAL, retry_backoff: float = DB_WRITE_RETRY_BACKOFF,
+                 max_backoff: float = DB_SYNC_MAX_BACKOFF):
+        self.db_manager = db_manager
+        self.spool = db_manager.spool
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+
+        self.written = 0
+        self.failures = 0
+
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._urgent = threading.Event()
+        self._waiters: List[threading.Event] = []
+        self._unsynced = 0
+        self._backoff = 0.0
+        self._closed = False
+
+        requeued = self.spool.requeue_parked()
+        if requeued:
+            print(f"Local spool: retrying {requeued} rows the server rejected last time")
+        if self.spool.count():
+            print(f"Local spool: {self.spool.count()} rows waiting to sync")
+            self._start()
+
+    def submit(self, session_id: str, analysis_data: Dict):
+        if not session_id:
+            return
+
+        self.db_manager.save_analysis_result(session_id, analysis_data)
+
+        with self._lock:
+            if self._closed:
+                return
+            self._unsynced += 1
+            self._start()
+            if self._unsynced >= self.batch_size:
+                self._wake.set()
+
+    def flush(self, wait: bool = True, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._closed or not self._start():
+                return self.spool.count() == 0
+            done = threading.Event()
+            self._waiters.append(done)
+            self._urgent.set()
+            self._wake.set()
+
+        if not wait:
+            return True
+        return done.wait(timeout) and self.spool.count() == 0
+
+    def close(self, timeout: Optional[float] = None):
+        self.flush(timeout=timeout)
+
+        with self._lock:
+            self._closed = True
+            self._urgent.set()
+            self._wake.set()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout)
+
+        remaining = self.spool.count()
+        if remaining:
+            print(f"Local spool: {remaining} rows kept for the next sync")
+        parked = self.spool.count(parked=True)
+        if parked:
+            print(f"Local spool: {parked} rejected rows parked, retried on next start")
+        if self.written:
+            print(f"Result writer closed: {self.written} rows synced")
+
+    @property
+    def pending(self) -> int:
+        return self.spool.count()
+
+    def _start(self) -> bool:
+        if not self.db_manager.connected:
+            return False
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="db-sync", daemon=True)
+            self._thread.start()
+        return True
+
+    def _run(self):
+        while True:
+            if self._backoff:
+                self._urgent.wait(self._backoff)
+            else:
+                self._wake.wait(self.flush_interval)
+
+            with self._lock:
+                self._wake.clear()
+                self._urgent.clear()
+                waiters, self._waiters = self._waiters, []
+                self._unsynced = 0
+                closed = self._closed
+
+            error = self._sync()
+            if error is None:
+                self._backoff = 0.0
+            else:
+                self.failures += 1
+                self._backoff = min(self.max_backoff, max(self.retry_backoff, self._backoff * 2))
+                print(f"{error}, retrying in {self._backoff:.1f}s")
+
+            for waiter in waiters:
+                waiter.set()
+
+            if closed:
+                return
+
+    def _sync(self) -> Optional[str]:
+        for table in SYNC_TABLES:
+            while True:
+                entries = self.spool.pending(table, self.batch_size)
+                if not entries:
+                    break
+
+                seqs = [seq for seq, _ in entries]
+                try:
+                    self.db_manager.push_rows(table, [row for _, row in entries])
+                except Exception as e:
+                    if not self._rejected(e):
+                        self.spool.record_failure(seqs, str(e))
+                        return f"Error syncing {len(entries)} {table} rows: {e}"
+
+                    error = self._isolate(table, entries)
+                    if error is not None:
+                        return error
+                    continue
+
+                self.spool.remove(seqs)
+                self.written += len(entries)
+
+        return None
+
+    def _isolate(self, table: str, entries: List[Tuple[int, Dict]]) -> Optional[str]:
+        parts = [entries]
+        rejected = []
+
+        while parts:
+            part = parts.pop()
+            seqs = [seq for seq, _ in part]
+            try:
+                self.db_manager.push_rows(table, [row for _, row in part])
+            except Exception as e:
+                if not self._rejected(e):
+                    self.spool.record_failure(seqs, str(e))
+                    return f"Error syncing {len(part)} {table} rows: {e}"
+                if len(part) == 1:
+                    self.spool.record_failure(seqs, str(e))
+                    rejected.append((seqs[0], part[0][1].get("id"), e))
+                else:
+                    middle = len(part) // 2
+                    parts.extend([part[middle:], part[:middle]])
+                continue
+
+            self.spool.remove(seqs)
+            self.written += len(part)
+
+        self.spool.park([seq for seq, _, _ in rejected])
+        for _, row_id, error in rejected:
+            print(f"Local spool: parked {table} row {row_id} rejected by the server: {error}")
+
+        return None
+
+    @staticmethod
+    def _rejected(error: Exception) -> bool:
+        code = str(getattr(error, "code", "") or "")
+        return code.startswith(REJECTED_ERROR_CODES)
@@ -0,0 +1,171 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.config import FRAME_CACHE_MAX_BYTES, FRAME_CACHE_MAX_FRAMES
+
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def fit_bgr(image: np.ndarray, max_size: Tuple[int, int]) -> np.ndarray:
+    height, width = image.shape[:2]
+    scale = min(max_size[0] / width, max_size[1] / height, 1.0)
+
+    if scale >= 1.0:
+        return image
+
+    new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+
+
+class Frame:
+    def __init__(self, image_path: str, on_decode=None):
+        self.image_path = str(image_path)
+        self._bgr: Optional[np.ndarray] = None
+        self._size: Optional[Tuple[int, int]] = None
+        self._thumbnails: Dict[Tuple[int, int], Image.Image] = {}
+        self._lock = threading.Lock()
+        self._on_decode = on_decode
+
+    @property
+    def bgr(self) -> np.ndarray:
+        with self._lock:
+            if self._bgr is None:
+                image = cv2.imread(self.image_path)
+                if image is None:
+                    raise ValueError(f"Could not load image: {self.image_path}")
+                image.setflags(write=False)
+                self._bgr = image
+                self._size = (image.shape[1], image.shape[0])
+                decoded = True
+            else:
+                decoded = False
+            image = self._bgr
+
+        if decoded and self._on_decode is not None:
+            self._on_decode(self)
+
+        return image
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        if self._size is None:
+            height, width = self.bgr.shape[:2]
+            return (width, height)
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        image = self._bgr
+        return image.nbytes if image is not None else 0
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._bgr is not None
+
+    def copy_bgr(self) -> np.ndarray:
+        return self.bgr.copy()
+
+    def resized_bgr(self, max_size: Tuple[int, int]) -> np.ndarray:
+        return fit_bgr(self.bgr, max_size)
+
+    def thumbnail(self, max_size: Tuple[int, int]) -> Image.Image:
+        max_size = (int(max_size[0]), int(max_size[1]))
+
+        thumb = self._thumbnails.get(max_size)
+        if thumb is None:
+            if self.is_decoded:
+                small = self.resized_bgr(max_size)
+            else:
+                small = self._decode_reduced(max_size)
+            thumb = Image.fromarray(cv2.cvtColor(small, cv2.COLOR_BGR2RGB))
+            self._thumbnails[max_size] = thumb
+
+        return thumb
+
+    def _decode_reduced(self, max_size: Tuple[int, int]) -> np.ndarray:
+        with Image.open(self.image_path) as header:
+            width, height = header.size
+
+        scale = max(min(max_size[0] / width, max_size[1] / height),
+                    min(max_size[0] / height, max_size[1] / width))
+
+        flags = cv2.IMREAD_COLOR
+        for factor, reduced_flags in REDUCED_DECODE_FLAGS:
+            if factor * scale <= 1.0:
+                flags = reduced_flags
+                break
+
+        image = cv2.imread(self.image_path, flags)
+        if image is None:
+            raise ValueError(f"Could not load image: {self.image_path}")
+
+        return fit_bgr(image, max_size)
+
+    def release(self):
+        with self._lock:
+            self._bgr = None
+
+
+class FrameCache:
+    def __init__(self, max_bytes: int = FRAME_CACHE_MAX_BYTES, max_frames: int = FRAME_CACHE_MAX_FRAMES):
+        self.max_bytes = max_bytes
+        self.max_frames = max_frames
+        self._frames: "OrderedDict[str, Frame]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, image_path: str) -> Frame:
+        key = str(Path(image_path).resolve())
+
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is None:
+                frame = Frame(image_path, on_decode=self._on_decode)
+                self._frames[key] = frame
+                while len(self._frames) > self.max_frames:
+                    _, evicted = self._frames.popitem(last=False)
+                    evicted.release()
+            else:
+                self._frames.move_to_end(key)
+
+            return frame
+
+    def clear(self):
+        with self._lock:
+            for frame in self._frames.values():
+                frame.release()
+            self._frames.clear()
+
+    def _on_decode(self, frame: Frame):
+        with self._lock:
+            total = sum(f.nbytes for f in self._frames.values())
+
+            for other in list(self._frames.values()):
+                if total <= self.max_bytes:
+                    break
+                if other is frame or not other.is_decoded:
+                    continue
+                total -= other.nbytes
+                other.release()
+
+
+_frame_cache = FrameCache()
+
+
+def get_frame(image) -> Frame:
+    if isinstance(image, Frame):
+        return image
+    return _frame_cache.get(image)
+
+
+def get_frame_cache() -> FrameCache:
+    return _frame_cache
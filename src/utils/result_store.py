@@ -0,0 +1,201 @@
+import pickle
+import shutil
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.analysis.annotation import AnnotatedImage
+from src.analysis.detections import Keypoints, RawDetections
+from src.config import TEMP_DIR, RESULT_STORE_MAX_BYTES
+
+RESULT_STORE_DIR = TEMP_DIR / "result_store"
+HEAVY_KEYS = ("analysis_data", "raw_detections", "annotation")
+DETECTION_OVERHEAD_BYTES = 1024
+
+
+class ResultStore:
+    def __init__(self, max_bytes: int = RESULT_STORE_MAX_BYTES, spill_dir: Optional[Path] = None):
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else RESULT_STORE_DIR / uuid.uuid4().hex
+        self._entries: List[Dict] = []
+        self._resident: "OrderedDict[int, None]" = OrderedDict()
+        self.nbytes = 0
+        self._lock = threading.RLock()
+
+    def append(self, result: Dict):
+        compact = {key: value for key, value in result.items() if key not in HEAVY_KEYS}
+        if isinstance(compact.get("keypoints"), Keypoints):
+            compact["keypoints"] = Keypoints(np.array(compact["keypoints"].array))
+
+        heavy = {key: result[key] for key in HEAVY_KEYS if key in result}
+        annotation = heavy.get("annotation")
+
+        with self._lock:
+            idx = len(self._entries)
+            self._entries.append({
+                "compact": compact,
+                "heavy": heavy,
+                "renderer": annotation.renderer if annotation is not None else None,
+                "path": None,
+                "renders_path": None,
+                "nbytes": 0
+            })
+            if annotation is not None:
+                annotation.on_render = lambda: self._on_render(idx)
+            self._resident[idx] = None
+            self._account(idx)
+            self._enforce_budget()
+
+    def extend(self, results):
+        for result in results:
+            self.append(result)
+
+    def replace(self, results):
+        with self._lock:
+            self.clear()
+            self.extend(results)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._resident.clear()
+            self.nbytes = 0
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        with self._lock:
+            if idx < 0:
+                idx += len(self._entries)
+            entry = self._entries[idx]
+
+            if entry["heavy"] is None:
+                self._load(idx)
+                self._account(idx)
+            self._resident[idx] = None
+            self._resident.move_to_end(idx)
+
+            result = dict(entry["compact"])
+            result.update(entry["heavy"])
+
+            self._enforce_budget(keep=idx)
+            return result
+
+    def compact(self, idx: int) -> Dict:
+        with self._lock:
+            return dict(self._entries[idx]["compact"])
+
+    def resident(self, idx: int) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries[idx]
+            if entry["heavy"] is None:
+                return None
+
+            result = dict(entry["compact"])
+            result.update(entry["heavy"])
+            return result
+
+    def raw_analysis(self, idx: int) -> Tuple[str, RawDetections, float]:
+        with self._lock:
+            entry = self._entries[idx]
+            heavy = entry["heavy"]
+            raw = heavy["raw_detections"] if heavy is not None else self._read(entry["path"])["raw_detections"]
+            compact = entry["compact"]
+            return compact["image_path"], raw, compact["processing_time"]
+
+    def __iter__(self) -> Iterator[Dict]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return self.nbytes
+
+    def _account(self, idx: int):
+        entry = self._entries[idx]
+        size = self._entry_bytes(entry)
+        self.nbytes += size - entry["nbytes"]
+        entry["nbytes"] = size
+
+    def _enforce_budget(self, keep: Optional[int] = None):
+        for idx in list(self._resident):
+            if self.nbytes <= self.max_bytes:
+                break
+            if idx == keep:
+                continue
+            self._spill(idx)
+
+    def _on_render(self, idx: int):
+        with self._lock:
+            if idx in self._resident:
+                self._account(idx)
+                self._enforce_budget(keep=idx)
+
+    def _spill(self, idx: int):
+        entry = self._entries[idx]
+        heavy = entry["heavy"]
+
+        if entry["path"] is None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            entry["path"] = self.spill_dir / f"{idx}.pkl.z"
+            self._write(entry["path"], {key: value for key, value in heavy.items() if key != "annotation"})
+
+        annotation = heavy.get("annotation")
+        renders = annotation.renders if annotation is not None else {}
+        if renders:
+            entry["renders_path"] = self.spill_dir / f"{idx}.renders.pkl.z"
+            self._write(entry["renders_path"], renders)
+
+        entry["heavy"] = None
+        self.nbytes -= entry["nbytes"]
+        entry["nbytes"] = 0
+        self._resident.pop(idx, None)
+
+    def _load(self, idx: int):
+        entry = self._entries[idx]
+        heavy = self._read(entry["path"])
+
+        if entry["renderer"] is not None:
+            renders = self._read(entry["renders_path"]) if entry["renders_path"] is not None else {}
+            heavy["annotation"] = AnnotatedImage(entry["compact"]["image_path"], heavy.get("analysis_data"),
+                                                 entry["renderer"], renders, on_render=lambda: self._on_render(idx))
+        entry["heavy"] = heavy
+
+    @staticmethod
+    def _write(path: Path, payload):
+        path.write_bytes(zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 3))
+
+    @staticmethod
+    def _read(path: Path):
+        return pickle.loads(zlib.decompress(path.read_bytes()))
+
+    def _entry_bytes(self, entry: Dict) -> int:
+        heavy = entry["heavy"]
+        if heavy is None:
+            return 0
+
+        total = 0
+        raw = heavy.get("raw_detections")
+        if raw is not None:
+            total += raw.boxes.nbytes + raw.confidences.nbytes + raw.class_ids.nbytes
+            total += raw.keypoints.nbytes if raw.keypoints is not None else 0
+
+        analysis_data = heavy.get("analysis_data")
+        if analysis_data is not None:
+            total += DETECTION_OVERHEAD_BYTES * (1 + len(analysis_data.get("detections", [])))
+
+        annotation = heavy.get("annotation")
+        if annotation is not None:
+            total += annotation.nbytes
+
+        return total
@@ -0,0 +1,73 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.config import SPOOL_PATH
+
+
+class LocalSpool:
+    def __init__(self, path: Path = SPOOL_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS spool (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                table_name TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                parked INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(spool)")}
+        if "parked" not in columns:
+            self._conn.execute("ALTER TABLE spool ADD COLUMN parked INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_spool_table ON spool(table_name, seq)")
+
+    def add(self, table: str, row: Dict):
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO spool (id, table_name, payload) VALUES (?, ?, ?)",
+                               (row["id"], table, json.dumps(row)))
+
+    def pending(self, table: str, limit: int) -> List[Tuple[int, Dict]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, payload FROM spool WHERE table_name = ? AND parked = 0 ORDER BY seq LIMIT ?",
+                (table, limit)
+            ).fetchall()
+        return [(seq, json.loads(payload)) for seq, payload in rows]
+
+    def remove(self, seqs: Sequence[int]):
+        with self._lock:
+            self._conn.executemany("DELETE FROM spool WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def record_failure(self, seqs: Sequence[int], error: str):
+        with self._lock:
+            self._conn.executemany("UPDATE spool SET attempts = attempts + 1, last_error = ? WHERE seq = ?",
+                                   [(error[:500], seq) for seq in seqs])
+
+    def park(self, seqs: Sequence[int]):
+        with self._lock:
+            self._conn.executemany("UPDATE spool SET parked = 1 WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def requeue_parked(self) -> int:
+        with self._lock:
+            return self._conn.execute("UPDATE spool SET parked = 0 WHERE parked = 1").rowcount
+
+    def count(self, table: Optional[str] = None, parked: bool = False) -> int:
+        with self._lock:
+            if table is None:
+                return self._conn.execute("SELECT COUNT(*) FROM spool WHERE parked = ?", (int(parked),)).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM spool WHERE table_name = ? AND parked = ?",
+                                      (table, int(parked))).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,125 +1,139 @@
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('TkAgg')
 from matplotlib.figure import Figure
 import numpy as np
-from typing import Dict, List
 
-class PostureVisualizer:
-    @staticmethod
-    def create_shoulder_plot(shoulder_imbalance: float) -> Figure:
-        fig = Figure(figsize=(3, 3), facecolor='white')
-        ax = fig.add_subplot(111)
-
-        ax.set_xlim(0, 10)
-        ax.set_ylim(0, 10)
-        ax.set_title('ANALISIS SUDUT BAHU', fontsize=10, fontweight='bold')
-        ax.set_xlabel('')
-        ax.set_ylabel('')
+class PostureChart:
+    def __init__(self, title: str, value: float = 0.0):
+        self.figure = Figure(figsize=(3, 3), facecolor='white')
+        self.ax = self.figure.add_subplot(111)
 
-        left_y = 5
-        right_y = 5 - (shoulder_imbalance / 10)
+        self.ax.set_xlim(0, 10)
+        self.ax.set_ylim(0, 10)
+        self.ax.set_title(title, fontsize=10, fontweight='bold')
 
-        ax.plot([2, 8], [left_y, right_y], 'b-', linewidth=3, label=f'Slope: {shoulder_imbalance/10:.1f}°')
-        ax.scatter([2, 8], [left_y, right_y], c='blue', s=100, zorder=5)
+        self.value = None
+        self.build()
+        self.ax.grid(True, alpha=0.3)
+        self.update(value)
 
-        ax.legend(loc='upper right', fontsize=8)
-        ax.grid(True, alpha=0.3)
+    def build(self):
+        pass
 
-        return fig
+    def update(self, value: float) -> bool:
+        if value == self.value:
+            return False
 
-    @staticmethod
-    def create_hip_plot(hip_imbalance: float) -> Figure:
-        fig = Figure(figsize=(3, 3), facecolor='white')
-        ax = fig.add_subplot(111)
+        self.value = value
+        self.apply(value)
+        return True
 
-        ax.set_xlim(0, 10)
-        ax.set_ylim(0, 10)
-        ax.set_title('ANALISIS SUDUT PINGGUL', fontsize=10, fontweight='bold')
+    def apply(self, value: float):
+        pass
 
-        left_y = 5
-        right_y = 5 - (hip_imbalance / 10)
+    def _set_legend(self, label: str):
+        legend = self.ax.get_legend()
+        if legend is None:
+            self.ax.legend(loc='upper right', fontsize=8)
+        else:
+            legend.get_texts()[0].set_text(label)
 
-        ax.plot([2, 8], [left_y, right_y], 'g-', linewidth=3, label=f'Pelvic Tilt: {hip_imbalance/10:.1f}°')
-        ax.scatter([2, 8], [left_y, right_y], c='green', s=100, zorder=5)
 
-        ax.legend(loc='upper right', fontsize=8)
-        ax.grid(True, alpha=0.3)
+class LevelChart(PostureChart):
+    def __init__(self, title: str, color: str, label: str, value: float = 0.0):
+        self.color = color
+        self.label = label
+        super().__init__(title, value)
 
-        return fig
+    def build(self):
+        self.line, = self.ax.plot([2, 8], [5, 5], '-', color=self.color, linewidth=3)
+        self.points = self.ax.scatter([2, 8], [5, 5], c=self.color, s=100, zorder=5)
 
-    @staticmethod
-    def create_spine_plot(spine_deviation: float) -> Figure:
-        fig = Figure(figsize=(3, 3), facecolor='white')
-        ax = fig.add_subplot(111)
+    def apply(self, value: float):
+        left_y = 5
+        right_y = 5 - (value / 10)
+        label = f'{self.label}: {value/10:.1f}°'
 
-        ax.set_xlim(0, 10)
-        ax.set_ylim(0, 10)
-        ax.set_title('ANALISIS SUDUT TULANG BELAKANG', fontsize=10, fontweight='bold')
+        self.line.set_data([2, 8], [left_y, right_y])
+        self.line.set_label(label)
+        self.points.set_offsets([[2, left_y], [8, right_y]])
+        self._set_legend(label)
 
-        center_x = 5
-        deviation_x = center_x + (spine_deviation / 20)
 
-        ax.plot([center_x, deviation_x], [2, 8], 'purple', linewidth=3, label=f'Curvature: {spine_deviation/10:.1f}°')
-        ax.axvline(x=center_x, color='gray', linestyle='--', alpha=0.5)
+class SpineChart(PostureChart):
+    def build(self):
+        self.line, = self.ax.plot([5, 5], [2, 8], color='purple', linewidth=3)
+        self.ax.axvline(x=5, color='gray', linestyle='--', alpha=0.5)
 
-        ax.legend(loc='upper right', fontsize=8)
-        ax.grid(True, alpha=0.3)
+    def apply(self, value: float):
+        label = f'Curvature: {value/10:.1f}°'
+        self.line.set_data([5, 5 + (value / 20)], [2, 8])
+        self.line.set_label(label)
+        self._set_legend(label)
 
-        return fig
 
-    @staticmethod
-    def create_head_tilt_plot(head_tilt: float) -> Figure:
-        fig = Figure(figsize=(3, 3), facecolor='white')
-        ax = fig.add_subplot(111)
+class HeadTiltChart(PostureChart):
+    def build(self):
+        self.line, = self.ax.plot([5, 7], [6, 6], 'b-', linewidth=3)
+        self.ax.scatter([5], [6], c='blue', s=100, zorder=5)
 
-        ax.set_xlim(0, 10)
-        ax.set_ylim(0, 10)
-        ax.set_title('ANALISIS SUDUT KEPALA', fontsize=10, fontweight='bold')
+    def apply(self, value: float):
+        angle_rad = np.radians(value)
+        label = f'Head Tilt: {value:.1f}°'
+        self.line.set_data([5, 5 + 2 * np.cos(angle_rad)], [6, 6 + 2 * np.sin(angle_rad)])
+        self.line.set_label(label)
+        self._set_legend(label)
 
-        center_x = 5
-        center_y = 6
 
-        angle_rad = np.radians(head_tilt)
-        end_x = center_x + 2 * np.cos(angle_rad)
-        end_y = center_y + 2 * np.sin(angle_rad)
+class FootChart(PostureChart):
+    def build(self):
+        self.ax.plot([3, 7], [5, 5], 'r-', linewidth=3)
+        self.ax.scatter([3, 7], [5, 5], c='red', s=100, zorder=5)
 
-        ax.plot([center_x, end_x], [center_y, end_y], 'b-', linewidth=3, label=f'Head Tilt: {head_tilt:.1f}°')
-        ax.scatter([center_x], [center_y], c='blue', s=100, zorder=5)
 
-        ax.legend(loc='upper right', fontsize=8)
-        ax.grid(True, alpha=0.3)
+class ScapularChart(PostureChart):
+    def build(self):
+        self.text = self.ax.text(5, 5, '', ha='center', va='center', fontsize=12, fontweight='bold')
 
-        return fig
+    def apply(self, value: float):
+        self.text.set_text(f'Scapular Angle: {value:.1f}°')
 
-    @staticmethod
-    def create_foot_plot() -> Figure:
-        fig = Figure(figsize=(3, 3), facecolor='white')
-        ax = fig.add_subplot(111)
 
-        ax.set_xlim(0, 10)
-        ax.set_ylim(0, 10)
-        ax.set_title('ANALISIS SUDUT KAKI', fontsize=10, fontweight='bold')
+CHARTS = {
+    "shoulder": lambda: LevelChart('ANALISIS SUDUT BAHU', 'blue', 'Slope'),
+    "hip": lambda: LevelChart('ANALISIS SUDUT PINGGUL', 'green', 'Pelvic Tilt'),
+    "spine": lambda: SpineChart('ANALISIS SUDUT TULANG BELAKANG'),
+    "head_tilt": lambda: HeadTiltChart('ANALISIS SUDUT KEPALA'),
+    "foot": lambda: FootChart('ANALISIS SUDUT KAKI'),
+    "scapular": lambda: ScapularChart('RINGKASAN SUDUT POSTURAL'),
+}
 
-        ax.plot([3, 7], [5, 5], 'r-', linewidth=3)
-        ax.scatter([3, 7], [5, 5], c='red', s=100, zorder=5)
 
-        ax.grid(True, alpha=0.3)
+class PostureVisualizer:
+    @staticmethod
+    def create_chart(name: str, value: float = 0.0) -> PostureChart:
+        chart = CHARTS[name]()
+        chart.update(value)
+        return chart
 
-        return fig
+    @staticmethod
+    def create_shoulder_plot(shoulder_imbalance: float) -> Figure:
+        return PostureVisualizer.create_chart("shoulder", shoulder_imbalance).figure
 
     @staticmethod
-    def create_scapular_plot(scapular_angle: float) -> Figure:
-        fig = Figure(figsize=(3, 3), facecolor='white')
-        ax = fig.add_subplot(111)
+    def create_hip_plot(hip_imbalance: float) -> Figure:
+        return PostureVisualizer.create_chart("hip", hip_imbalance).figure
 
-        ax.set_xlim(0, 10)
-        ax.set_ylim(0, 10)
-        ax.set_title('RINGKASAN SUDUT POSTURAL', fontsize=10, fontweight='bold')
+    @staticmethod
+    def create_spine_plot(spine_deviation: float) -> Figure:
+        return PostureVisualizer.create_chart("spine", spine_deviation).figure
 
-        ax.text(5, 5, f'Scapular Angle: {scapular_angle:.1f}°',
-               ha='center', va='center', fontsize=12, fontweight='bold')
+    @staticmethod
+    def create_head_tilt_plot(head_tilt: float) -> Figure:
+        return PostureVisualizer.create_chart("head_tilt", head_tilt).figure
 
-        ax.grid(True, alpha=0.3)
+    @staticmethod
+    def create_foot_plot() -> Figure:
+        return PostureVisualizer.create_chart("foot").figure
 
-        return fig
+    @staticmethod
+    def create_scapular_plot(scapular_angle: float) -> Figure:
+        return PostureVisualizer.create_chart("scapular", scapular_angle).figure
@@ -0,0 +1,17 @@
+/*
+  # Allow updates to analysis_results
+
+  ## Overview
+  The bulk re-scoring job (`python -m src.analysis.rescore`) recomputes `score` and
+  `measurements` from the stored `keypoints` and writes them back with an upsert on `id`.
+
+  ## Security
+  - Adds a public UPDATE policy on analysis_results, matching the existing public
+    read/insert policies for standalone app usage
+*/
+
+CREATE POLICY "Allow public update to analysis_results"
+  ON analysis_results FOR UPDATE
+  TO public
+  USING (true)
+  WITH CHECK (true);
@@ -0,0 +1,89 @@
+/*
+  # Compact keypoint and measurement storage
+
+  ## Overview
+  `keypoints` and `measurements` were stored as JSON strings inside jsonb columns, repeating
+  every keypoint name, position tuple and confidence-level label on each row. This migration
+  adds packed columns and moves existing rows over to them.
+
+  ## Columns Added to analysis_results
+  - `keypoints_packed` (bytea) - 17 keypoints x (x, y, confidence) as big-endian float32,
+    in COCO keypoint order (nose, left_eye, ..., right_ankle); 204 bytes per row.
+    Missing keypoints are stored as zeros.
+  - `measurements_packed` (double precision[]) - fixed-order array of
+    (ratio, shoulder_imbalance, hip_imbalance, spine_deviation, shoulder_angle, hip_angle,
+    head_shift, head_tilt, score); measurements that do not apply to the analysis type are NULL.
+
+  ## Data
+  - Existing rows are backfilled from the jsonb columns with `pack_keypoints` and
+    `pack_measurements`, after which the legacy jsonb values are reset to '{}'
+  - The application writes only the packed columns; the decoders in
+    `src/utils/database.py` still read the legacy columns when the packed ones are NULL
+*/
+
+ALTER TABLE analysis_results ADD COLUMN IF NOT EXISTS keypoints_packed bytea
+  CHECK (keypoints_packed IS NULL OR octet_length(keypoints_packed) = 204);
+ALTER TABLE analysis_results ADD COLUMN IF NOT EXISTS measurements_packed double precision[]
+  CHECK (measurements_packed IS NULL OR array_length(measurements_packed, 1) = 9);
+
+CREATE OR REPLACE FUNCTION unwrap_json_string(value jsonb)
+RETURNS jsonb
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT CASE WHEN jsonb_typeof(value) = 'string' THEN (value #>> '{}')::jsonb ELSE value END;
+$$;
+
+CREATE OR REPLACE FUNCTION pack_keypoints(keypoints jsonb)
+RETURNS bytea
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+DECLARE
+  names text[] := ARRAY[
+    'nose', 'left_eye', 'right_eye', 'left_ear', 'right_ear',
+    'left_shoulder', 'right_shoulder', 'left_elbow', 'right_elbow',
+    'left_wrist', 'right_wrist', 'left_hip', 'right_hip',
+    'left_knee', 'right_knee', 'left_ankle', 'right_ankle'
+  ];
+  name text;
+  point jsonb;
+  packed bytea := ''::bytea;
+BEGIN
+  keypoints := COALESCE(unwrap_json_string(keypoints), '{}'::jsonb);
+
+  FOREACH name IN ARRAY names LOOP
+    point := keypoints -> name;
+    IF point IS NULL OR point -> 'position' IS NULL THEN
+      packed := packed || float4send(0) || float4send(0) || float4send(0);
+    ELSE
+      packed := packed
+        || float4send((point -> 'position' ->> 0)::real)
+        || float4send((point -> 'position' ->> 1)::real)
+        || float4send(COALESCE((point ->> 'confidence')::real, 0));
+    END IF;
+  END LOOP;
+
+  RETURN packed;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION pack_measurements(measurements jsonb)
+RETURNS double precision[]
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT array_agg((COALESCE(unwrap_json_string(measurements), '{}'::jsonb) ->> key)::double precision
+                   ORDER BY position)
+  FROM unnest(ARRAY[
+    'ratio', 'shoulder_imbalance', 'hip_imbalance', 'spine_deviation', 'shoulder_angle',
+    'hip_angle', 'head_shift', 'head_tilt', 'score'
+  ]) WITH ORDINALITY AS keys(key, position);
+$$;
+
+UPDATE analysis_results
+SET keypoints_packed = pack_keypoints(keypoints),
+    measurements_packed = pack_measurements(measurements),
+    keypoints = '{}'::jsonb,
+    measurements = '{}'::jsonb
+WHERE keypoints_packed IS NULL;
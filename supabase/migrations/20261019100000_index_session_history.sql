@@ -0,0 +1,14 @@
+/*
+  # Index session history queries
+
+  ## Overview
+  History views and exports read analysis_results newest-first with keyset pagination on
+  (created_at, id). Unfiltered queries use the existing `idx_analysis_created`; this adds a
+  composite index so per-session queries can page without sorting the whole session.
+
+  ## Indexes Added
+  - `idx_analysis_session_created` on analysis_results(session_id, created_at DESC, id DESC)
+*/
+
+CREATE INDEX IF NOT EXISTS idx_analysis_session_created
+  ON analysis_results(session_id, created_at DESC, id DESC);
@@ -0,0 +1,193 @@
+/*
+  # Per-person trend aggregates
+
+  ## Overview
+  Sessions were only identified by free-text `name`, so following one person's progress meant
+  scanning every analysis row. This migration adds a normalized, indexed person key and a
+  per-person, per-day, per-classification aggregate table that triggers keep up to date.
+
+  ## Columns Added
+  ### user_sessions
+  - `person_key` (text, generated) - `name` lower-cased with whitespace collapsed and trimmed;
+    must match `DatabaseManager.person_key` in `src/utils/database.py`
+
+  ## Tables Created
+  ### person_daily_aggregates
+  - `person_key` (text) - Person key from user_sessions
+  - `day` (date) - Day of `analysis_results.created_at`
+  - `classification` (text) - Posture classification
+  - `result_count` (integer) - Number of analysis results
+  - `score_count` (integer) - Number of analysis results with a non-null score
+  - `score_sum`, `score_min`, `score_max` (numeric) - Score statistics
+  - Primary key (person_key, day, classification)
+
+  ## Views Created
+  - `person_daily_trends` - aggregates with `score_mean` (over non-null scores only)
+
+  ## Maintenance
+  - AFTER INSERT on analysis_results adds the row to its aggregate incrementally
+  - AFTER UPDATE/DELETE recompute the affected aggregate rows (min/max cannot be
+    maintained incrementally when a score changes or a row disappears); the recompute
+    upserts so concurrent writers for the same person and day do not collide
+  - Both paths take a transaction-scoped advisory lock on (person_key, day, classification)
+    first, so a recompute cannot overwrite the increment of a concurrent insert
+  - Existing analysis_results are aggregated once by this migration
+
+  ## Security
+  - RLS enabled with public read access; aggregates are only written by the trigger
+    functions, which run as SECURITY DEFINER
+*/
+
+ALTER TABLE user_sessions ADD COLUMN IF NOT EXISTS person_key text
+  GENERATED ALWAYS AS (lower(btrim(regexp_replace(name, '\s+', ' ', 'g')))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_sessions_person ON user_sessions(person_key, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS person_daily_aggregates (
+  person_key text NOT NULL,
+  day date NOT NULL,
+  classification text NOT NULL,
+  result_count integer NOT NULL DEFAULT 0,
+  score_count integer NOT NULL DEFAULT 0,
+  score_sum numeric NOT NULL DEFAULT 0,
+  score_min numeric,
+  score_max numeric,
+  PRIMARY KEY (person_key, day, classification)
+);
+
+CREATE OR REPLACE VIEW person_daily_trends AS
+  SELECT person_key,
+         day,
+         classification,
+         result_count,
+         score_count,
+         score_sum,
+         round(score_sum / NULLIF(score_count, 0), 2) AS score_mean,
+         score_min,
+         score_max
+  FROM person_daily_aggregates;
+
+ALTER TABLE person_daily_aggregates ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow public read access to person_daily_aggregates"
+  ON person_daily_aggregates FOR SELECT
+  TO public
+  USING (true);
+
+CREATE OR REPLACE FUNCTION lock_person_daily_aggregate(p_person_key text, p_day date, p_classification text)
+RETURNS void
+LANGUAGE sql
+AS $$
+  SELECT pg_advisory_xact_lock(hashtext(p_person_key || '|' || p_day::text || '|' || p_classification));
+$$;
+
+CREATE OR REPLACE FUNCTION refresh_person_daily_aggregate(p_person_key text, p_day date, p_classification text)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM lock_person_daily_aggregate(p_person_key, p_day, p_classification);
+
+  INSERT INTO person_daily_aggregates
+    (person_key, day, classification, result_count, score_count, score_sum, score_min, score_max)
+  SELECT s.person_key, r.created_at::date, r.classification,
+         count(*), count(r.score), COALESCE(sum(r.score), 0), min(r.score), max(r.score)
+  FROM analysis_results r
+  JOIN user_sessions s ON s.id = r.session_id
+  WHERE s.person_key = p_person_key
+    AND r.created_at::date = p_day
+    AND r.classification = p_classification
+  GROUP BY s.person_key, r.created_at::date, r.classification
+  ON CONFLICT (person_key, day, classification) DO UPDATE
+  SET result_count = EXCLUDED.result_count,
+      score_count = EXCLUDED.score_count,
+      score_sum = EXCLUDED.score_sum,
+      score_min = EXCLUDED.score_min,
+      score_max = EXCLUDED.score_max;
+
+  IF NOT FOUND THEN
+    DELETE FROM person_daily_aggregates
+    WHERE person_key = p_person_key AND day = p_day AND classification = p_classification;
+  END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION add_to_person_daily_aggregate()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  key text;
+BEGIN
+  SELECT person_key INTO key FROM user_sessions WHERE id = NEW.session_id;
+  IF key IS NULL THEN
+    RETURN NEW;
+  END IF;
+
+  PERFORM lock_person_daily_aggregate(key, NEW.created_at::date, NEW.classification);
+
+  INSERT INTO person_daily_aggregates AS a
+    (person_key, day, classification, result_count, score_count, score_sum, score_min, score_max)
+  VALUES (key, NEW.created_at::date, NEW.classification, 1, (NEW.score IS NOT NULL)::integer,
+          COALESCE(NEW.score, 0), NEW.score, NEW.score)
+  ON CONFLICT (person_key, day, classification) DO UPDATE
+  SET result_count = a.result_count + 1,
+      score_count = a.score_count + EXCLUDED.score_count,
+      score_sum = a.score_sum + COALESCE(EXCLUDED.score_sum, 0),
+      score_min = LEAST(a.score_min, EXCLUDED.score_min),
+      score_max = GREATEST(a.score_max, EXCLUDED.score_max);
+
+  RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION refresh_person_daily_aggregate_for_row()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  key text;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    SELECT person_key INTO key FROM user_sessions WHERE id = OLD.session_id;
+    IF key IS NOT NULL THEN
+      PERFORM refresh_person_daily_aggregate(key, OLD.created_at::date, OLD.classification);
+    END IF;
+  END IF;
+
+  IF TG_OP = 'UPDATE' THEN
+    SELECT person_key INTO key FROM user_sessions WHERE id = NEW.session_id;
+    IF key IS NOT NULL THEN
+      PERFORM refresh_person_daily_aggregate(key, NEW.created_at::date, NEW.classification);
+    END IF;
+    RETURN NEW;
+  END IF;
+
+  RETURN OLD;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_analysis_results_aggregate_insert ON analysis_results;
+CREATE TRIGGER trg_analysis_results_aggregate_insert
+  AFTER INSERT ON analysis_results
+  FOR EACH ROW EXECUTE FUNCTION add_to_person_daily_aggregate();
+
+DROP TRIGGER IF EXISTS trg_analysis_results_aggregate_change ON analysis_results;
+CREATE TRIGGER trg_analysis_results_aggregate_change
+  AFTER UPDATE OF score, classification, created_at, session_id OR DELETE ON analysis_results
+  FOR EACH ROW EXECUTE FUNCTION refresh_person_daily_aggregate_for_row();
+
+INSERT INTO person_daily_aggregates
+  (person_key, day, classification, result_count, score_count, score_sum, score_min, score_max)
+SELECT s.person_key, r.created_at::date, r.classification,
+       count(*), count(r.score), COALESCE(sum(r.score), 0), min(r.score), max(r.score)
+FROM analysis_results r
+JOIN user_sessions s ON s.id = r.session_id
+GROUP BY s.person_key, r.created_at::date, r.classification
+ON CONFLICT (person_key, day, classification) DO NOTHING;
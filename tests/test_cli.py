@@ -0,0 +1,52 @@
+import sys
+import types
+
+import numpy as np
+
+import src.cli as cli
+from src.analysis.detections import RawDetections
+
+
+class FakeAnalyzer:
+    def __init__(self, model_path):
+        self.model_path = model_path
+
+    def infer_batch(self, images, confidence_threshold, batch_size=1):
+        inferred = []
+        for image in images:
+            if image.endswith("bad.jpg"):
+                raise ValueError(f"Could not load image: {image}")
+            keypoints = np.random.default_rng(0).random((1, 17, 3), dtype=np.float32) * 100
+            raw = RawDetections(np.zeros((1, 4), dtype=np.float32), np.array([0.9], dtype=np.float32),
+                                np.array([0]), keypoints, {0: "normal"})
+            inferred.append((image, raw, 0.01))
+        return inferred
+
+
+def test_skipped_image_keeps_heights_aligned(tmp_path, monkeypatch):
+    heights = {"a.jpg": 1500.0, "bad.jpg": 2000.0, "c.jpg": 1700.0, "d.jpg": 1800.0}
+    for name in heights:
+        (tmp_path / name).write_bytes(b"")
+
+    manifest = tmp_path / "heights.csv"
+    manifest.write_text("image,height\n" + "".join(f"{name},{height}\n" for name, height in heights.items()))
+
+    fake_module = types.ModuleType("src.analysis.yolo_analyzer")
+    fake_module.YOLOPostureAnalyzer = FakeAnalyzer
+    monkeypatch.setitem(sys.modules, "src.analysis.yolo_analyzer", fake_module)
+
+    scored = {}
+    build_results = cli.build_results
+
+    def recording_build_results(raw_analyses, confidence, result_heights):
+        for (path, _, _), height in zip(raw_analyses, result_heights):
+            scored[path.rsplit("/", 1)[-1]] = height
+        return build_results(raw_analyses, confidence, result_heights)
+
+    monkeypatch.setattr(cli, "build_results", recording_build_results)
+
+    status = cli.main([str(tmp_path / "*.jpg"), "--model", "fake.pt", "--height-manifest", str(manifest),
+                       "--output", str(tmp_path / "out.csv"), "--batch-size", "4"])
+
+    assert status == 0
+    assert scored == {"a.jpg": 1500.0, "c.jpg": 1700.0, "d.jpg": 1800.0}
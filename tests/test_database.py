@@ -0,0 +1,90 @@
+from src.utils.database import DatabaseManager
+from src.utils.spool import LocalSpool
+
+
+class FakeQuery:
+    def __init__(self, rows, calls):
+        self.rows = rows
+        self.calls = calls
+        self.filters = []
+        self.size = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(("eq", column, value))
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(("gte", column, value))
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(("lt", column, value))
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(("lte", column, value))
+        return self
+
+    def or_(self, condition):
+        self.filters.append(("or", condition))
+        return self
+
+    def order(self, column, desc=False):
+        return self
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    def execute(self):
+        self.calls.append(self.filters)
+        rows = self.rows
+        for kind, *args in self.filters:
+            if kind == "lte":
+                rows = [row for row in rows if row["created_at"] <= args[1]]
+            elif kind == "or":
+                created_at, row_id = self.cursor
+                rows = [row for row in rows if (row["created_at"], row["id"]) < (created_at, row_id)]
+        return type("Result", (), {"data": rows[:self.size]})()
+
+    @property
+    def cursor(self):
+        condition = next(args[0] for kind, *args in self.filters if kind == "or")
+        created_at = condition.split('"')[1]
+        row_id = condition.rsplit("id.lt.", 1)[1].rstrip(")")
+        return created_at, row_id
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def table(self, name):
+        return FakeQuery(self.rows, self.calls)
+
+
+def make_manager(tmp_path, rows):
+    manager = DatabaseManager(spool=LocalSpool(tmp_path / "spool.db"))
+    manager.connected = True
+    manager._client = FakeClient(rows)
+    return manager
+
+
+def test_keyset_pages_bound_created_at(tmp_path):
+    rows = sorted(({"id": f"{idx:03d}", "created_at": f"2026-10-{10 + idx // 4:02d}T00:00:00"}
+                   for idx in range(25)), key=lambda row: (row["created_at"], row["id"]), reverse=True)
+    manager = make_manager(tmp_path, rows)
+
+    pages = list(manager.iter_analysis_pages("id, created_at", page_size=10))
+
+    assert [row["id"] for page in pages for row in page] == [row["id"] for row in rows]
+
+    calls = manager.client.calls
+    assert not any(kind == "lte" for kind, *_ in calls[0])
+    for filters, previous in zip(calls[1:], pages):
+        assert ("lte", "created_at", previous[-1]["created_at"]) in filters
+        assert any(kind == "or" for kind, *_ in filters)
@@ -0,0 +1,29 @@
+import cv2
+import numpy as np
+
+from src.utils import frame as frame_module
+from src.utils.frame import FrameCache
+
+
+def test_thumbnail_decodes_reduced_without_full_frame(tmp_path, monkeypatch):
+    path = tmp_path / "large.jpg"
+    cv2.imwrite(str(path), np.full((1600, 2400, 3), 128, dtype=np.uint8))
+
+    flags = []
+    imread = cv2.imread
+
+    def recording_imread(image_path, *args):
+        flags.append(args[0] if args else cv2.IMREAD_COLOR)
+        return imread(image_path, *args)
+
+    monkeypatch.setattr(frame_module.cv2, "imread", recording_imread)
+
+    cache = FrameCache(max_bytes=1, max_frames=8)
+    frame = cache.get(str(path))
+    thumb = frame.thumbnail((150, 150))
+
+    assert thumb.size == (150, 100)
+    assert flags == [cv2.IMREAD_REDUCED_COLOR_8]
+    assert not frame.is_decoded
+    assert frame.thumbnail((150, 150)) is thumb
+    assert len(flags) == 1
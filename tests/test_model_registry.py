@@ -0,0 +1,39 @@
+import importlib
+import sys
+import threading
+import types
+
+import pytest
+
+
+def load_registry_module(monkeypatch, yolo_class):
+    fake = types.ModuleType("ultralytics")
+    fake.YOLO = yolo_class
+    monkeypatch.setitem(sys.modules, "ultralytics", fake)
+    monkeypatch.delitem(sys.modules, "src.analysis.model_registry", raising=False)
+    return importlib.import_module("src.analysis.model_registry")
+
+
+def test_model_cancelled_after_load_is_kept(tmp_path, monkeypatch):
+    cancel = threading.Event()
+    loads = []
+
+    class FakeYOLO:
+        def __init__(self, path):
+            loads.append(path)
+            cancel.set()
+
+        def __call__(self, image, verbose=False):
+            return []
+
+    module = load_registry_module(monkeypatch, FakeYOLO)
+    path = tmp_path / "model.pt"
+    path.write_bytes(b"weights")
+    registry = module.ModelRegistry()
+
+    with pytest.raises(module.ModelLoadCancelled):
+        registry.get(str(path), cancel=cancel)
+
+    assert registry.is_loaded(str(path))
+    assert isinstance(registry.get(str(path)), FakeYOLO)
+    assert len(loads) == 1
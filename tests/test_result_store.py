@@ -0,0 +1,31 @@
+import numpy as np
+
+from src.analysis.detections import RawDetections
+from src.utils.result_store import ResultStore
+
+
+def make_result(idx):
+    raw = RawDetections(np.zeros((4, 4), dtype=np.float32), np.zeros(4, dtype=np.float32),
+                        np.zeros(4, dtype=np.int64), None, {0: "normal"})
+    return {
+        "image_path": f"{idx}.jpg",
+        "processing_time": 0.0,
+        "raw_detections": raw,
+        "analysis_data": {"detections": [{}]}
+    }
+
+
+def test_budget_keeps_running_total(tmp_path, monkeypatch):
+    store = ResultStore(max_bytes=20000, spill_dir=tmp_path)
+    calls = []
+    entry_bytes = store._entry_bytes
+    monkeypatch.setattr(store, "_entry_bytes", lambda entry: calls.append(entry) or entry_bytes(entry))
+
+    store.extend(make_result(idx) for idx in range(200))
+    for idx in range(0, 200, 7):
+        assert store[idx]["image_path"] == f"{idx}.jpg"
+
+    resident = [store._entries[idx] for idx in store._resident]
+    assert store.resident_bytes() == sum(entry_bytes(entry) for entry in resident)
+    assert store.resident_bytes() <= store.max_bytes
+    assert len(calls) <= 200 + 2 * len(range(0, 200, 7))
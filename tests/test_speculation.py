@@ -0,0 +1,86 @@
+import sys
+import types
+
+from src.analysis.detections import RawDetections
+from src.main import PostureAnalysisApp
+
+
+class FakeAnalyzer:
+    def infer_batch(self, images, confidence_threshold, batch_size=1):
+        raw = RawDetections.empty({0: "normal"})
+        return [(image, raw, 0.0) for image in images]
+
+
+class FakeRegistry:
+    def __init__(self, loaded):
+        self.loaded = loaded
+
+    def get(self, model_path, progress=None, cancel=None):
+        self.loaded.append(model_path)
+
+
+def make_app(loaded):
+    app = PostureAnalysisApp.__new__(PostureAnalysisApp)
+    app.speculative_enabled = True
+    app.analysis_running = False
+    app.analysis_results = None
+    app.unmatched_raw = []
+    app.confidence_threshold = 0.25
+    app.inference_floor = 0.05
+    app.batch_size = 4
+    app.analysis_workers = 1
+    app._speculation = None
+    app._model_preload = None
+
+    def get_analyzer(model_path=None):
+        loaded.append(model_path)
+        return FakeAnalyzer()
+
+    app._get_analyzer = get_analyzer
+    return app
+
+
+def wait_for(speculation):
+    if speculation is not None and speculation._thread is not None:
+        speculation._thread.join(5)
+
+
+def test_changed_model_is_not_restarted_by_floor_change(monkeypatch):
+    loaded = []
+    registry = FakeRegistry(loaded)
+    monkeypatch.setitem(sys.modules, "src.analysis.model_registry",
+                        types.SimpleNamespace(get_model_registry=lambda: registry))
+
+    app = make_app(loaded)
+    images = ["a.jpg", "b.jpg"]
+
+    app.speculate(images, "old.pt")
+    wait_for(app._speculation)
+    assert loaded == ["old.pt"]
+
+    app.preload_model("new.pt")
+    app._model_preload[1].set()
+    assert app._speculation is None
+
+    app.apply_confidence_threshold(0.01)
+    wait_for(app._speculation)
+
+    assert "old.pt" not in loaded[1:]
+
+
+def test_disabled_speculation_is_forgotten():
+    loaded = []
+    app = make_app(loaded)
+
+    app.speculate(["a.jpg"], "old.pt")
+    wait_for(app._speculation)
+
+    app.speculative_enabled = False
+    app.speculate(["a.jpg"], "old.pt")
+    assert app._speculation is None
+
+    app.speculative_enabled = True
+    app.apply_confidence_threshold(0.01)
+
+    assert app._speculation is None
+    assert loaded == ["old.pt"]